@@ -0,0 +1,133 @@
+import struct
+
+import numpy as np
+
+# file layout:
+#   header   magic, version, width, height, frame count, fps, encoding,
+#            offset of the frame index (0 for raw files)
+#   frames   raw: frame_count * height * width bytes, one byte code per cell
+#            rle/delta: variable-size (run length, byte) pairs
+#   index    rle/delta only: uint64 start offset of every frame, plus the end
+MAGIC = b'ASCA'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHIfB3xQ')
+
+ENCODINGS = ('raw', 'rle', 'delta')
+
+
+def rle_encode(frame):
+    """Encode a uint8 array as (run length, value) byte pairs, runs capped at 255."""
+    flat = frame.ravel()
+    starts = np.flatnonzero(np.diff(flat, prepend=flat[:1] ^ 1))
+    lengths = np.diff(np.append(starts, len(flat)))
+    values = flat[starts]
+
+    # split runs longer than 255 into full chunks plus a remainder
+    chunks = (lengths + 254) // 255
+    values = np.repeat(values, chunks)
+    counts = np.full(chunks.sum(), 255, dtype=np.int64)
+    last_chunk = np.cumsum(chunks) - 1
+    counts[last_chunk] = lengths - 255 * (chunks - 1)
+
+    pairs = np.empty((len(values), 2), dtype=np.uint8)
+    pairs[:, 0] = counts
+    pairs[:, 1] = values
+    return pairs.tobytes()
+
+
+def rle_decode(data, size):
+    pairs = np.frombuffer(data, dtype=np.uint8).reshape(-1, 2)
+    frame = np.repeat(pairs[:, 1], pairs[:, 0])
+    if len(frame) != size:
+        raise ValueError("Corrupt animation frame.")
+    return frame
+
+
+class AnimationWriter:
+    """Streams frames to an animation file; the header is finalized on close()."""
+
+    def __init__(self, path, width, height, fps, encoding='raw'):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Invalid encoding: {encoding}")
+        self.file = open(path, 'wb')
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.encoding = encoding
+        self.frame_count = 0
+        self.offsets = []
+        self.previous = None
+        self.file.write(b'\0' * HEADER.size)
+
+    def write(self, frame):
+        """Append one (height, width) uint8 frame."""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.shape != (self.height, self.width):
+            raise ValueError(f"Frame shape {frame.shape} does not match {(self.height, self.width)}.")
+        self.offsets.append(self.file.tell())
+        if self.encoding == 'raw':
+            self.file.write(frame.tobytes())
+        elif self.encoding == 'rle':
+            self.file.write(rle_encode(frame))
+        else:
+            # XOR against the previous frame; unchanged cells become long zero runs
+            delta = frame if self.previous is None else frame ^ self.previous
+            self.file.write(rle_encode(delta))
+            self.previous = frame.copy()
+        self.frame_count += 1
+
+    def close(self):
+        index_offset = 0
+        if self.encoding != 'raw':
+            index_offset = self.file.tell()
+            self.offsets.append(index_offset)
+            self.file.write(np.array(self.offsets, dtype=np.uint64).tobytes())
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.width, self.height, self.frame_count,
+                                    self.fps, ENCODINGS.index(self.encoding), index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AnimationReader:
+    """Memory-maps an animation file and yields its frames without reading it all."""
+
+    def __init__(self, path):
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self.data) < HEADER.size:
+            raise ValueError(f"{path} is not an animation file.")
+        (magic, version, self.width, self.height, self.frame_count,
+         self.fps, encoding, index_offset) = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or encoding >= len(ENCODINGS):
+            raise ValueError(f"{path} is not an animation file.")
+        self.encoding = ENCODINGS[encoding]
+        frame_size = self.width * self.height
+        if self.encoding == 'raw':
+            # zero-copy view: every frame is a slice of the mapping
+            body = self.data[HEADER.size:HEADER.size + self.frame_count * frame_size]
+            self.frames = body.reshape(self.frame_count, self.height, self.width)
+        else:
+            self.offsets = self.data[index_offset:].view(np.uint64)
+
+    def __len__(self):
+        return self.frame_count
+
+    def __iter__(self):
+        """Frames in order, as (height, width) uint8 arrays."""
+        if self.encoding == 'raw':
+            yield from self.frames
+            return
+        size = self.width * self.height
+        frame = None
+        for start, end in zip(self.offsets[:-1], self.offsets[1:]):
+            decoded = rle_decode(self.data[int(start):int(end)], size).reshape(self.height, self.width)
+            if self.encoding == 'delta' and frame is not None:
+                frame = frame ^ decoded
+            else:
+                frame = decoded
+            yield frame
@@ -0,0 +1,465 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from color import COLOR_MODES, Palette
+from kernels import BACKENDS
+from loaders import STL_RECORD, load_obj, load_stl
+from renderer import (ASCIICanvas3D, AVAILABLE_SHAPES, MODES, SHAPES, STAGES, Renderer, render_frame,
+                      render_scene, rotate_vertex, project_vertex, perspective_projection, supports_mode)
+from present import TerminalPresenter
+from scene import scatter
+from transform import transform_vertices
+
+# select graphic rendition (color) escape sequences
+SGR = re.compile('\033\\[[0-9;]*m')
+
+
+def best_time(func, repeat):
+    """Return the fastest of `repeat` runs of func() in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_transform(args):
+    """Compare the per-vertex rotate/project path with the batched transform."""
+    rng = np.random.default_rng(0)
+    width, height = 80, 40
+    angles = (0.3, 0.7, 1.1)
+    project = project_vertex if args.projection == 'o' else perspective_projection
+
+    print(f"{'N':>8} {'per-vertex ms':>14} {'batched ms':>11} {'speedup':>8}")
+    for n in args.sizes:
+        vertices = rng.uniform(-5, 5, size=(n, 3))
+
+        def per_vertex():
+            rotated = [rotate_vertex(v, *angles) for v in vertices]
+            return [project(v, width, height) for v in rotated]
+
+        def batched():
+            return transform_vertices(vertices, angles, width, height, args.projection)
+
+        # both paths must agree before their timings mean anything
+        expected = np.array(per_vertex())
+        _, projected = batched()
+        assert np.allclose(projected, expected), "batched transform diverged"
+
+        slow = best_time(per_vertex, args.repeat)
+        fast = best_time(batched, args.repeat)
+        print(f"{n:>8} {slow * 1e3:>14.3f} {fast * 1e3:>11.3f} {slow / fast:>7.1f}x")
+
+
+def bench_render(args):
+    """
+    Render frames headlessly for every shape, mode and projection, and
+    report throughput and per-stage timings as JSON.
+    """
+    results = []
+    with open(os.devnull, 'w') as devnull:
+        for shape_name in args.shapes:
+            shape = SHAPES.get(shape_name, segments=args.segments)
+            for mode in args.modes:
+                if not supports_mode(shape, mode):
+                    continue
+                for projection in args.projections:
+                    canvas = ASCIICanvas3D(args.width, args.height, depth_buffer=mode != 'wireframe')
+                    canvas.presenter = TerminalPresenter(stream=devnull)
+                    # an untimed first frame loads (or compiles) the raster kernels
+                    render_frame(canvas, shape, (0, 0, 0), mode, projection)
+                    timings = dict.fromkeys(STAGES, 0.0)
+                    frame_times = []
+                    for frame in range(args.frames):
+                        angle = 0.02 * frame
+                        start = time.perf_counter()
+                        render_frame(canvas, shape, (angle, angle, angle), mode, projection, timings)
+                        present_start = time.perf_counter()
+                        canvas.display()
+                        end = time.perf_counter()
+                        timings["present"] += end - present_start
+                        frame_times.append(end - start)
+
+                    frame_times = np.array(frame_times)
+                    results.append({
+                        "shape": shape_name,
+                        "mode": mode,
+                        "projection": projection,
+                        "vertices": len(shape.vertices),
+                        "frames": args.frames,
+                        "fps": args.frames / frame_times.sum(),
+                        "p50_ms": float(np.percentile(frame_times, 50) * 1e3),
+                        "p99_ms": float(np.percentile(frame_times, 99) * 1e3),
+                        "stages_ms": {stage: total / args.frames * 1e3 for stage, total in timings.items()},
+                        "bytes_per_frame": canvas.presenter.total_bytes / args.frames,
+                    })
+
+    report = {
+        "width": args.width,
+        "height": args.height,
+        "segments": args.segments,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def bench_scene(args):
+    """Render scenes of a growing number of instances and report frame times."""
+    meshes = [SHAPES.get(name) for name in args.shapes]
+    if args.mode == 'solid':
+        meshes = [mesh for mesh in meshes if hasattr(mesh, 'faces')]
+    canvas = ASCIICanvas3D(args.width, args.height, depth_buffer=args.mode == 'solid')
+
+    print(f"{'instances':>9} {'drawn':>7} {'ms/frame':>9} {'p99 ms':>7} {'fps':>7}")
+    for count in args.counts:
+        scene = scatter(meshes, count)
+        # an untimed first frame loads (or compiles) the raster kernels
+        render_scene(canvas, scene, (0, 0, 0), args.mode, args.projection)
+        frame_times = []
+        drawn = 0
+        for frame in range(args.frames):
+            angle = 0.02 * frame
+            start = time.perf_counter()
+            drawn += render_scene(canvas, scene, (angle, angle, angle), args.mode, args.projection)
+            frame_times.append(time.perf_counter() - start)
+        frame_times = np.array(frame_times)
+        print(f"{count:>9} {drawn / args.frames:>7.1f} {frame_times.mean() * 1e3:>9.2f} "
+              f"{np.percentile(frame_times, 99) * 1e3:>7.2f} {args.frames / frame_times.sum():>7.1f}")
+
+
+def torus_mesh(triangles):
+    """A closed triangulated torus with about the given number of triangles."""
+    n = max(3, int(np.sqrt(triangles / 2)))
+    u, v = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+    theta, phi = 2 * np.pi * u / n, 2 * np.pi * v / n
+    vertices = np.stack([(3 + np.cos(phi)) * np.cos(theta),
+                         (3 + np.cos(phi)) * np.sin(theta),
+                         np.sin(phi)], axis=-1).reshape(-1, 3)
+    a, b = u * n + v, (u + 1) % n * n + v
+    c, d = (u + 1) % n * n + (v + 1) % n, u * n + (v + 1) % n
+    faces = np.concatenate([np.stack([a, b, c], axis=-1).reshape(-1, 3),
+                            np.stack([a, c, d], axis=-1).reshape(-1, 3)])
+    return vertices.astype(np.float32), faces
+
+
+def write_stl(path, vertices, faces):
+    records = np.zeros(len(faces), dtype=STL_RECORD)
+    records['vertices'] = vertices[faces]
+    with open(path, 'wb') as f:
+        f.write(b'\0' * 80)
+        f.write(np.uint32(len(faces)).tobytes())
+        records.tofile(f)
+
+
+def write_obj(path, vertices, faces):
+    with open(path, 'w') as f:
+        np.savetxt(f, vertices, fmt='v %.7g %.7g %.7g')
+        np.savetxt(f, faces + 1, fmt='f %d %d %d')
+
+
+def bench_load(args):
+    """Load generated binary STL and OBJ files and report load time and peak memory."""
+    loaders = {'stl': (write_stl, load_stl), 'obj': (write_obj, load_obj)}
+    print(f"{'format':>6} {'triangles':>10} {'MB':>7} {'vertices':>9} {'edges':>9} "
+          f"{'load ms':>9} {'MB/s':>7} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for triangles in args.triangles:
+            vertices, faces = torus_mesh(triangles)
+            for name in args.formats:
+                write, load = loaders[name]
+                path = os.path.join(directory, f"torus.{name}")
+                write(path, vertices, faces)
+                size = os.path.getsize(path) / 1e6
+
+                seconds = best_time(lambda: load(path), args.repeat)
+                tracemalloc.start()
+                model = load(path)
+                peak = tracemalloc.get_traced_memory()[1] / 1e6
+                tracemalloc.stop()
+                print(f"{name:>6} {len(model.faces):>10} {size:>7.1f} {len(model.vertices):>9} "
+                      f"{len(model.edges):>9} {seconds * 1e3:>9.1f} {size / seconds:>7.1f} {peak:>8.1f}")
+
+
+def frame_allocations(render, frames, warmup=5):
+    """
+    Trace render(frame) with tracemalloc. Returns the peak bytes allocated
+    within each frame and the growth of traced memory over all frames.
+    """
+    for frame in range(warmup):
+        render(frame)
+    # allocated before tracing, so the results are not counted as growth
+    peaks = np.zeros(frames, dtype=np.int64)
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for i, frame in enumerate(range(warmup, warmup + frames)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        render(frame)
+        peaks[i] = tracemalloc.get_traced_memory()[1] - before
+    growth = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return peaks, growth
+
+
+def bench_alloc(args):
+    """
+    Check that steady-state frames allocate a bounded amount of memory:
+    every frame's peak stays within --max-frame-kb and nothing accumulates
+    across frames. Compares render_frame with fresh scratch arrays against
+    a Renderer that keeps them. numpy holds on to a bounded cache of small
+    freed buffers, which tracemalloc still counts, hence the growth
+    allowance.
+    """
+    print(f"{'shape':>8} {'mode':>9} {'vertices':>8} {'fresh KB':>9} {'renderer KB':>12} {'growth B':>9}")
+    for shape_name, mode in (("cube", "solid"), ("figure8", "solid"), ("sphere", "wireframe"),
+                             ("donut", "wireframe")):
+        shape = SHAPES.get(shape_name, segments=args.segments)
+        canvas = ASCIICanvas3D(args.width, args.height, depth_buffer=mode == 'solid')
+        renderer = Renderer(args.width, args.height, mode)
+
+        def fresh(frame):
+            angle = 0.02 * frame
+            render_frame(canvas, shape, (angle, angle, angle), mode, 'p')
+
+        fresh_peaks, _ = frame_allocations(fresh, args.frames)
+        peaks, growth = frame_allocations(lambda frame: renderer.draw(shape, frame / 30), args.frames)
+
+        assert peaks.max() <= args.max_frame_kb * 1024, \
+            f"a frame allocates {peaks.max()} bytes, over the {args.max_frame_kb} KB budget"
+        assert growth <= args.max_growth, f"{growth} bytes retained over {args.frames} frames"
+        assert peaks.max() <= fresh_peaks.max(), "Renderer allocates more than fresh buffers"
+        print(f"{shape_name:>8} {mode:>9} {len(shape.vertices):>8} {fresh_peaks.max() / 1024:>9.1f} "
+              f"{peaks.max() / 1024:>12.1f} {growth:>9}")
+
+
+def bench_mesh(args):
+    """Report the vertices, edges and faces optimize_mesh removes from each shape."""
+    print(f"{'shape':>12} {'vertices':>15} {'edges':>15} {'faces':>15}")
+    for shape_name in args.shapes:
+        shape = SHAPES.get(shape_name, segments=args.segments)
+        columns = []
+        for kind in ('vertices', 'edges', 'faces'):
+            after = len(getattr(shape, kind, ()))
+            before = after + shape.removed[kind]
+            columns.append(f"{before:>6} -> {after:<6}" if before else f"{'-':>15}")
+        print(f"{shape_name:>12} " + " ".join(columns))
+
+
+def bench_color(args):
+    """
+    Encode the same animation as plain text and in each color mode, and
+    compare bytes per frame, SGR sequences per frame and encode time.
+    Frames are rendered up front so only the encoder is timed.
+    """
+    print(f"{'shape':>8} {'mode':>9} {'color':>9} {'bytes/frame':>12} {'sgr/frame':>10} {'encode ms':>10}")
+    for shape_name in args.shapes:
+        shape = SHAPES.get(shape_name, segments=args.segments)
+        for mode in args.modes:
+            if not supports_mode(shape, mode):
+                continue
+            for color in ["off", *COLOR_MODES]:
+                palette = Palette(color) if color != 'off' else None
+                renderer = Renderer(args.width, args.height, mode, palette=palette)
+                frames = []
+                for frame in range(args.frames):
+                    canvas = renderer.draw(shape, frame / 30)
+                    attributes = canvas.attributes.copy() if palette is not None else None
+                    frames.append((canvas.pixels.copy(), attributes))
+
+                presenter = TerminalPresenter(palette=palette)
+                sizes, sequences = [], 0
+                start = time.perf_counter()
+                for pixels, attributes in frames:
+                    data = presenter.encode(pixels, attributes)
+                    sizes.append(len(data))
+                    sequences += len(SGR.findall(data))
+                seconds = time.perf_counter() - start
+                print(f"{shape_name:>8} {mode:>9} {color:>9} {np.mean(sizes):>12.0f} "
+                      f"{sequences / args.frames:>10.1f} {seconds / args.frames * 1e3:>10.3f}")
+
+
+def bench_kernels(args):
+    """
+    Render every shape, mode and projection with each raster kernel
+    backend, in plain text and in color, and check that all backends
+    produce the same pixels, colors and pixel counts. Reports ms per frame.
+    """
+    names = [name for name in args.backends if name in BACKENDS]
+    for name in sorted(set(args.backends) - set(names)):
+        print(f"skipping the {name} backend: not installed")
+    print(f"{'shape':>12} {'mode':>9} {'proj':>4} " + " ".join(f"{name + ' ms':>10}" for name in names))
+    for shape_name in args.shapes:
+        shape = SHAPES.get(shape_name, segments=args.segments)
+        for mode in MODES:
+            if not supports_mode(shape, mode):
+                continue
+            for projection in ("o", "p"):
+                times = []
+                reference = None
+                for name in names:
+                    frames = []
+                    seconds = 0.0
+                    for palette in (None, Palette("256")):
+                        renderer = Renderer(args.width, args.height, mode, projection, palette=palette,
+                                            backend=name)
+                        # the first frame compiles the kernels (or loads them from the cache)
+                        renderer.draw(shape, 0)
+                        start = time.perf_counter()
+                        for frame in range(args.frames):
+                            canvas = renderer.draw(shape, frame / 30)
+                            frames.append((canvas.pixels.copy(), None if palette is None
+                                           else canvas.attributes.copy(), canvas.pixels_written))
+                        seconds += time.perf_counter() - start
+                    times.append(seconds / (2 * args.frames))
+                    if reference is None:
+                        reference = frames
+                        continue
+                    for frame, (expected, actual) in enumerate(zip(reference, frames)):
+                        assert np.array_equal(expected[0], actual[0]), \
+                            f"{name} pixels differ: {shape_name} {mode} {projection} frame {frame}"
+                        assert (expected[1] is None) or np.array_equal(expected[1], actual[1]), \
+                            f"{name} colors differ: {shape_name} {mode} {projection} frame {frame}"
+                        assert expected[2] == actual[2], \
+                            f"{name} pixel counts differ: {shape_name} {mode} {projection} frame {frame}"
+                print(f"{shape_name:>12} {mode:>9} {projection:>4} "
+                      + " ".join(f"{seconds * 1e3:>10.3f}" for seconds in times))
+
+
+# imports the command-line program, then renders and presents one frame
+FIRST_FRAME = """
+import os, main
+from renderer import SHAPES, Renderer
+renderer = Renderer(80, 40, {mode!r}, backend={backend!r})
+renderer.canvas.presenter.stream = open(os.devnull, 'w')
+renderer.draw(SHAPES.get({shape!r}), 0)
+renderer.present()
+"""
+
+
+def bench_startup(args):
+    """
+    Cold-start wall time of fresh interpreters: parsing the command line
+    (main.py --help), and importing main.py, then rendering and presenting
+    a first frame, with each kernel backend. Reports the median of
+    --repeat runs.
+    """
+    cases = [("main.py --help", [sys.executable, "main.py", "--help"])]
+    for backend in args.backends:
+        snippet = FIRST_FRAME.format(mode=args.mode, backend=backend, shape=args.shape)
+        cases.append((f"first frame, {backend}", [sys.executable, "-c", snippet]))
+    print(f"{'case':>24} {'ms':>8}")
+    for name, command in cases:
+        # one untimed run fills the bytecode and compiled-kernel caches
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        print(f"{name:>24} {np.median(times) * 1e3:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the renderer.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    transform = subparsers.add_parser("transform", help="Vertex transform stage.")
+    transform.add_argument("--sizes", type=int, nargs="+", default=[8, 100, 900, 10000, 100000])
+    transform.add_argument("--repeat", type=int, default=5)
+    transform.add_argument("--projection", choices=["o", "p"], default="p")
+    transform.set_defaults(func=bench_transform)
+
+    render = subparsers.add_parser("render", help="Full render loop, headless.")
+    render.add_argument("--frames", type=int, default=200)
+    render.add_argument("--width", type=int, default=80)
+    render.add_argument("--height", type=int, default=40)
+    render.add_argument("--segments", type=int, default=None,
+                        help="Mesh resolution for Sphere, Donut and Figure8.")
+    render.add_argument("--shapes", nargs="+", default=AVAILABLE_SHAPES)
+    render.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    render.add_argument("--projections", nargs="+", choices=["o", "p"], default=["o", "p"])
+    render.add_argument("--output", help="Write the JSON report to this file.")
+    render.set_defaults(func=bench_render)
+
+    scene = subparsers.add_parser("scene", help="Many instances with frustum culling.")
+    scene.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 300, 1000])
+    scene.add_argument("--frames", type=int, default=50)
+    scene.add_argument("--width", type=int, default=80)
+    scene.add_argument("--height", type=int, default=40)
+    scene.add_argument("--shapes", nargs="+", default=AVAILABLE_SHAPES)
+    scene.add_argument("--mode", choices=["wireframe", "solid"], default="wireframe")
+    scene.add_argument("--projection", choices=["o", "p"], default="p")
+    scene.set_defaults(func=bench_scene)
+
+    load = subparsers.add_parser("load", help="Model loaders on generated files.")
+    load.add_argument("--triangles", type=int, nargs="+", default=[10000, 100000, 500000])
+    load.add_argument("--formats", nargs="+", choices=["stl", "obj"], default=["stl", "obj"])
+    load.add_argument("--repeat", type=int, default=3)
+    load.set_defaults(func=bench_load)
+
+    alloc = subparsers.add_parser("alloc", help="Per-frame allocations under tracemalloc.")
+    alloc.add_argument("--frames", type=int, default=40)
+    alloc.add_argument("--width", type=int, default=80)
+    alloc.add_argument("--height", type=int, default=40)
+    alloc.add_argument("--segments", type=int, default=24,
+                       help="Mesh resolution for Sphere, Donut and Figure8.")
+    alloc.add_argument("--max-frame-kb", type=int, default=128,
+                       help="Allocation budget per frame in KB (fits the default 80x40 canvas).")
+    alloc.add_argument("--max-growth", type=int, default=256 * 1024,
+                       help="Bytes that may stay allocated after all frames.")
+    alloc.set_defaults(func=bench_alloc)
+
+    color = subparsers.add_parser("color", help="ANSI encoder: plain text vs. 256-color and truecolor.")
+    color.add_argument("--frames", type=int, default=200)
+    color.add_argument("--width", type=int, default=80)
+    color.add_argument("--height", type=int, default=40)
+    color.add_argument("--segments", type=int, default=None,
+                       help="Mesh resolution for Sphere, Donut and Figure8.")
+    color.add_argument("--shapes", nargs="+", default=["cube", "sphere", "donut"])
+    color.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    color.set_defaults(func=bench_color)
+
+    kernels = subparsers.add_parser("kernels", help="Raster kernel backends: identical output and speed.")
+    kernels.add_argument("--frames", type=int, default=30)
+    kernels.add_argument("--width", type=int, default=80)
+    kernels.add_argument("--height", type=int, default=40)
+    kernels.add_argument("--segments", type=int, default=None,
+                         help="Mesh resolution for Sphere, Donut and Figure8.")
+    kernels.add_argument("--shapes", nargs="+", default=AVAILABLE_SHAPES + ["figure8"])
+    kernels.add_argument("--backends", nargs="+", choices=["numpy", "numba"], default=["numpy", "numba"])
+    kernels.set_defaults(func=bench_kernels)
+
+    startup = subparsers.add_parser("startup", help="Cold-start time of fresh interpreters.")
+    startup.add_argument("--repeat", type=int, default=7)
+    startup.add_argument("--shape", default="cube")
+    startup.add_argument("--mode", choices=MODES, default="wireframe")
+    startup.add_argument("--backends", nargs="+", choices=["numpy", "numba"], default=list(BACKENDS))
+    startup.set_defaults(func=bench_startup)
+
+    mesh = subparsers.add_parser("mesh", help="Geometry removed by mesh optimization.")
+    mesh.add_argument("--shapes", nargs="+", default=AVAILABLE_SHAPES + ["figure8"])
+    mesh.add_argument("--segments", type=int, default=None,
+                      help="Mesh resolution for Sphere, Donut and Figure8.")
+    mesh.set_defaults(func=bench_mesh)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import numpy as np
+
+COLOR_MODES = ("256", "truecolor")
+
+# channel levels of the xterm 6x6x6 color cube (codes 16-231)
+XTERM_CUBE = np.array([0, 95, 135, 175, 215, 255])
+# the 24-step gray ramp (codes 232-255)
+XTERM_GRAYS = 8 + 10 * np.arange(24)
+
+# SGR that restores the terminal's default foreground
+DEFAULT_SGR = '\033[39m'
+
+
+def xterm_index(rgb):
+    """Nearest xterm 256-color code for an (N, 3) array of RGB values."""
+    rgb = np.asarray(rgb, dtype=float).reshape(-1, 3)
+    steps = np.abs(rgb[:, :, None] - XTERM_CUBE).argmin(axis=2)
+    cube = XTERM_CUBE[steps]
+    gray_steps = np.abs(rgb.mean(axis=1, keepdims=True) - XTERM_GRAYS).argmin(axis=1)
+    gray = XTERM_GRAYS[gray_steps][:, None]
+    use_gray = ((gray - rgb) ** 2).sum(axis=1) < ((cube - rgb) ** 2).sum(axis=1)
+    return np.where(use_gray, 232 + gray_steps, 16 + steps @ np.array([36, 6, 1]))
+
+
+class Palette:
+    """
+    Foreground colors for brightness levels, as SGR escape sequences.
+
+    Canvases in color keep one uint8 attribute per cell beside the glyph:
+    0 is the terminal's default color and every other value indexes sgr.
+    Brightness is quantized to `levels` steps of `color`, sent as the
+    nearest xterm 256-color code or as 24-bit RGB. Levels that come out as
+    the same escape sequence share an attribute, so the encoder never
+    switches between two identical colors.
+    """
+
+    def __init__(self, mode="256", color=(255, 255, 255), levels=24):
+        if mode not in COLOR_MODES:
+            raise ValueError(f"Unknown color mode: {mode}")
+        if not 1 <= levels <= 255:
+            raise ValueError("A palette holds 1 to 255 levels.")
+        self.mode = mode
+        self.color = tuple(color)
+        self.levels = levels
+        rgb = np.rint(np.outer(np.arange(1, levels + 1) / levels, self.color)).astype(int)
+        if mode == "256":
+            sequences = [f'\033[38;5;{code}m' for code in xterm_index(rgb).tolist()]
+        else:
+            sequences = [f'\033[38;2;{r};{g};{b}m' for r, g, b in rgb.tolist()]
+        self.sgr = [DEFAULT_SGR]
+        attribute = {}
+        for sequence in sequences:
+            if sequence not in attribute:
+                attribute[sequence] = len(self.sgr)
+                self.sgr.append(sequence)
+        self.lookup = np.array([attribute[sequence] for sequence in sequences], dtype=np.uint8)
+
+    def attributes(self, brightness):
+        """Cell attributes for an array of brightness values in [0, 1]."""
+        return self.lookup[(np.asarray(brightness) * (self.levels - 1)).astype(int)]
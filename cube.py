@@ -16,19 +16,20 @@ class Cube:
             [c[0] - s, c[1] + s, c[2] + s],
         ])
         # Define the edges connecting the vertices
-        self.edges = [
+        self.edges = np.array([
             (0,1), (1,2), (2,3), (3,0),  # Bottom square
             (4,5), (5,6), (6,7), (7,4),  # Top square
             (0,4), (1,5), (2,6), (3,7)   # Vertical edges
-        ]
-        self.faces = [
-            (0, 1, 2, 3),  # Front face
+        ], dtype=np.int32)
+        # Faces wound counter-clockwise seen from outside, so normals point outward
+        self.faces = np.array([
+            (0, 3, 2, 1),  # Front face
             (4, 5, 6, 7),  # Back face
             (0, 1, 5, 4),  # Bottom face
             (2, 3, 7, 6),  # Top face
-            (0, 3, 7, 4),  # Left face
+            (0, 4, 7, 3),  # Left face
             (1, 2, 6, 5),  # Right face
-        ]
+        ], dtype=np.int32)
     def rotate(self, rotation_matrix):
         """Apply rotation to all vertices."""
         self.vertices = np.dot(self.vertices, rotation_matrix)
@@ -1,9 +1,7 @@
-import math
+import numpy as np
 
 class Donut:
     def __init__(self, R=10, r=3, segments=30):
-        self.vertices = []
-        self.edges = []
         self.R = R  # major radius
         self.r = r  # minor radius
         self.segments = segments
@@ -11,21 +9,36 @@ class Donut:
         self.generate_edges()
 
     def generate_vertices(self):
-        for i in range(self.segments):
-            theta = 2 * math.pi * i / self.segments
-            for j in range(self.segments):
-                phi = 2 * math.pi * j / self.segments
-                x = (self.R + self.r * math.cos(phi)) * math.cos(theta)
-                y = (self.R + self.r * math.cos(phi)) * math.sin(theta)
-                z = self.r * math.sin(phi)
-                self.vertices.append((x, y, z))
+        # theta runs around the major circle, phi around the tube
+        angles = 2 * np.pi * np.arange(self.segments) / self.segments
+        theta, phi = np.meshgrid(angles, angles, indexing='ij')
+        x = (self.R + self.r * np.cos(phi)) * np.cos(theta)
+        y = (self.R + self.r * np.cos(phi)) * np.sin(theta)
+        z = self.r * np.sin(phi)
+        self.vertices = np.stack([x, y, z], axis=-1).reshape(-1, 3)
 
     def generate_edges(self):
-        for i in range(self.segments):
-            for j in range(self.segments):
-                current = i * self.segments + j
-                next_i = (i + 1) % self.segments
-                next_j = (j + 1) % self.segments
-                self.edges.append((current, i * self.segments + next_j))
-                self.edges.append((current, next_i * self.segments + j))
+        n = self.segments
+        i, j = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+        current = i * n + j
+        self.edges = np.stack([
+            np.stack([current, i * n + (j + 1) % n], axis=-1),
+            np.stack([current, ((i + 1) % n) * n + j], axis=-1),
+        ], axis=2).reshape(-1, 2).astype(np.int32)
 
+    def surface(self, u, v):
+        """
+        Points and unit outward normals of the torus at parameters u (around
+        the major circle) and v (around the tube), both in [0, 1).
+        """
+        theta, phi = 2 * np.pi * np.asarray(u), 2 * np.pi * np.asarray(v)
+        normals = np.stack([np.cos(phi) * np.cos(theta), np.cos(phi) * np.sin(theta), np.sin(phi)],
+                           axis=-1)
+        points = self.r * normals
+        points[..., 0] += self.R * np.cos(theta)
+        points[..., 1] += self.R * np.sin(theta)
+        return points, normals
+
+    def surface_size(self):
+        """Longest distance covered along u and along v, for choosing sample counts."""
+        return 2 * np.pi * (self.R + self.r), 2 * np.pi * self.r
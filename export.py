@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from renderer import (DIRECTIONAL_LIGHT, MODES, POINT_LIGHT, ROTATION_SPEED, SHAPE_TYPES, SHAPES, Renderer,
+                      supports_mode)
+from present import TerminalPresenter
+
+
+def frame_angle(frame, fps):
+    """Rotation angle of a frame; a pure function of its index."""
+    return ROTATION_SPEED * frame / fps
+
+
+def render_chunk(job):
+    """
+    Worker: render frames [start, stop) and encode them.
+    For asciicast output each frame is an ANSI diff against the previous one,
+    with CRLF line ends; the first frame of a chunk is drawn in full so
+    chunks are independent.
+    """
+    start_time = time.perf_counter()
+    shape = SHAPES.get(job['shape'], segments=job['segments'])
+    light = POINT_LIGHT if job['light'] == 'point' else DIRECTIONAL_LIGHT
+    # zoomed to fit, so larger exports draw larger, more detailed shapes
+    renderer = Renderer(job['width'], job['height'], job['mode'], job['projection'], light)
+    presenter = TerminalPresenter()
+
+    encoded = []
+    for frame in range(job['start'], job['stop']):
+        angle = frame_angle(frame, job['fps'])
+        canvas = renderer.draw_angles(shape, (angle, angle, angle))
+        if job['format'] == 'cast':
+            # players write events to a terminal without output translation,
+            # so newlines go out as CRLF, as in server.wire
+            encoded.append(presenter.encode(canvas.pixels).replace('\n', '\r\n'))
+        else:
+            encoded.append(canvas.to_string())
+    return job['start'], encoded, os.getpid(), time.perf_counter() - start_time
+
+
+def export(args, out):
+    """Render all frames in worker processes and write them to out in order."""
+    if args.format == 'cast':
+        header = {
+            "version": 2,
+            "width": args.width,
+            "height": args.height,
+            "timestamp": int(time.time()),
+            "env": {"TERM": "xterm-256color"},
+        }
+        out.write(json.dumps(header) + "\n")
+
+    jobs = ({
+        'shape': args.shape, 'segments': args.segments, 'mode': args.mode,
+        'projection': args.projection, 'light': args.light, 'width': args.width,
+        'height': args.height, 'fps': args.fps, 'format': args.format,
+        'start': start, 'stop': min(start + args.chunk, args.frames),
+    } for start in range(0, args.frames, args.chunk))
+
+    worker_stats = {}
+    workers = args.workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # keep a bounded number of chunks in flight and write them in order
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(render_chunk, job))
+            if len(pending) >= 2 * workers:
+                write_chunk(pending.popleft().result(), args, out, worker_stats)
+        while pending:
+            write_chunk(pending.popleft().result(), args, out, worker_stats)
+    return worker_stats
+
+
+def write_chunk(result, args, out, worker_stats):
+    start, encoded, pid, elapsed = result
+    for offset, data in enumerate(encoded):
+        if args.format == 'cast':
+            out.write(json.dumps([(start + offset) / args.fps, "o", data]) + "\n")
+        else:
+            out.write(data + "\n\f\n")
+    frames, seconds = worker_stats.get(pid, (0, 0.0))
+    worker_stats[pid] = (frames + len(encoded), seconds + elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an animation using a pool of worker processes.")
+    parser.add_argument("output", help="Output file ('-' for stdout).")
+    parser.add_argument("--format", choices=["cast", "text"], default="cast",
+                        help="asciicast v2 ('cast') or a plain-text frame dump separated by form feeds.")
+    parser.add_argument("--shape", default="cube",
+                        choices=list(SHAPE_TYPES))
+    parser.add_argument("--mode", choices=MODES, default="wireframe")
+    parser.add_argument("--projection", choices=["o", "p"], default="p")
+    parser.add_argument("--light", choices=["point", "directional"], default="point")
+    parser.add_argument("--frames", type=int, default=300, help="Number of frames to render.")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=40)
+    parser.add_argument("--segments", type=int, default=None,
+                        help="Mesh resolution for Sphere, Donut and Figure8.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--chunk", type=int, default=50, help="Frames rendered per task.")
+    parser.add_argument("--report", action="store_true", help="Print frames/sec per worker to stderr.")
+    args = parser.parse_args()
+
+    shape = SHAPES.get(args.shape, segments=args.segments)
+    if not supports_mode(shape, args.mode):
+        parser.error(f"The shape '{args.shape}' does not support {args.mode} rendering.")
+
+    start = time.perf_counter()
+    if args.output == '-':
+        worker_stats = export(args, sys.stdout)
+    else:
+        with open(args.output, 'w') as out:
+            worker_stats = export(args, out)
+    elapsed = time.perf_counter() - start
+
+    if args.report:
+        for pid, (frames, seconds) in sorted(worker_stats.items()):
+            print(f"worker {pid}: {frames} frames, {frames / seconds:.1f} frames/sec", file=sys.stderr)
+        print(f"total: {args.frames} frames in {elapsed:.2f}s, {args.frames / elapsed:.1f} frames/sec",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -56,6 +56,9 @@ class Figure8:
             next_i = (i + 1) % segments
             self.faces.append((i, next_i, offset + next_i, offset + i))
 
+        self.edges = np.array(self.edges, dtype=np.int32)
+        self.faces = np.array(self.faces, dtype=np.int32)
+
     def rotate(self, angle_x, angle_y, angle_z):
         """Rotate all vertices around the center by given angles."""
         rotation_x = rotation_matrix_x(angle_x)
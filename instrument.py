@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class Span:
+    """Context manager timing one span into a Profiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, self.profiler.clock())
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every hook is a no-op."""
+
+    enabled = False
+    _span = NullSpan()
+
+    def span(self, name):
+        return self._span
+
+    def add(self, name, start, end):
+        pass
+
+    def count(self, name, value):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    """
+    Records named spans and counters per frame.
+
+    Spans become Chrome trace "complete" events (one track per thread) and
+    counters become "counter" events, written by save() in the trace-event
+    JSON format that chrome://tracing and Perfetto open. Per-stage times of
+    the last `window` frames are kept for the on-screen HUD. Spans and
+    counters may come from several threads (the pipeline's present thread);
+    a lock keeps them from racing with end_frame.
+    """
+
+    enabled = True
+
+    def __init__(self, window=30, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = clock()
+        self.pid = os.getpid()
+        self.events = []
+        self.frame = 0
+        self.stage_times = {}
+        self.counters = {}
+        self.recent = {}
+        self.recent_counters = {}
+        self.window = window
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        return Span(self, name)
+
+    def add(self, name, start, end):
+        """Record a span that ran from start to end on self.clock."""
+        with self.lock:
+            self.events.append({
+                "name": name, "ph": "X", "pid": self.pid, "tid": threading.get_ident(),
+                "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6,
+                "args": {"frame": self.frame},
+            })
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + end - start
+
+    def count(self, name, value):
+        """Add to a counter of the current frame."""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def end_frame(self):
+        """Close the current frame: emit its counters and roll the HUD averages."""
+        now = (self.clock() - self.origin) * 1e6
+        # take this frame's totals, so other threads add to the next frame's
+        with self.lock:
+            stage_times, counters = self.stage_times, self.counters
+            self.stage_times = {}
+            self.counters = {}
+            for name, value in counters.items():
+                self.events.append({"name": name, "ph": "C", "pid": self.pid, "ts": now,
+                                    "args": {name: value}})
+            self.frame += 1
+        # stages and counters missing from this frame count as zero
+        for name in stage_times:
+            self.recent.setdefault(name, deque(maxlen=self.window))
+        for name, times in self.recent.items():
+            times.append(stage_times.get(name, 0.0) * 1e3)
+        for name in counters:
+            self.recent_counters.setdefault(name, deque(maxlen=self.window))
+        for name, values in self.recent_counters.items():
+            values.append(counters.get(name, 0))
+
+    def hud(self):
+        """One line of per-stage milliseconds and counters, averaged over the window."""
+        stages = "  ".join(f"{name} {sum(times) / len(times):.2f}"
+                           for name, times in self.recent.items())
+        counters = "  ".join(f"{name} {sum(values) / len(values):.0f}"
+                             for name, values in self.recent_counters.items())
+        return f"ms: {stages}  |  {counters}" if counters else f"ms: {stages}"
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
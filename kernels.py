@@ -0,0 +1,122 @@
+import importlib.util
+
+import numpy as np
+
+# stand-ins for "no attribute buffer" in the compiled kernels, which need arrays
+NO_ATTRIBUTES = np.zeros((0, 0), dtype=np.uint8)
+NO_COLORS = np.zeros(0, dtype=np.uint8)
+
+
+def numpy_draw_lines(pixels, attributes, p0, p1, code, attribute):
+    """
+    Bresenham lines between (E, 2) integer endpoints p0 and p1, all edges
+    at once in closed form. Writes code (and attribute, if attributes is
+    not None) to every pixel inside pixels and returns how many were written.
+    """
+    height, width = pixels.shape
+    delta = np.abs(p1 - p0)
+    step = np.where(p0 < p1, 1, -1)
+    major = delta.max(axis=1)
+    minor = delta.min(axis=1)
+    x_major = delta[:, 0] >= delta[:, 1]
+
+    # one entry per pixel: the edge it belongs to and its index along the line
+    counts = major + 1
+    edge = np.repeat(np.arange(len(p0)), counts)
+    i = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    # closed form of the Bresenham error term; ties stay on the minor axis
+    n = major[edge]
+    j = np.where(n > 0, (2 * i * minor[edge] + n - 1) // np.maximum(2 * n, 1), 0)
+    xm = x_major[edge]
+    xs = p0[edge, 0] + step[edge, 0] * np.where(xm, i, j)
+    ys = p0[edge, 1] + step[edge, 1] * np.where(xm, j, i)
+
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    pixels[ys[inside], xs[inside]] = code
+    if attributes is not None:
+        attributes[ys[inside], xs[inside]] = attribute
+    return int(np.count_nonzero(inside))
+
+
+def numpy_fill_spans(pixels, attributes, ys, x_start, x_end, codes, colors):
+    """Fill the horizontal spans [x_start, x_end] of rows ys, each with its own code and color."""
+    for i, (y, xs, xe) in enumerate(zip(ys.tolist(), x_start.tolist(), x_end.tolist())):
+        if xs <= xe:
+            pixels[y, xs:xe + 1] = codes[i]
+            if attributes is not None:
+                attributes[y, xs:xe + 1] = colors[i]
+
+
+def numpy_fill_spans_depth(pixels, depth, attributes, ys, x_start, x_end, planes, codes, colors):
+    """
+    Fill spans like numpy_fill_spans, writing only pixels whose depth
+    a * x + b * y + c (planes holds a, b, c per span) is not behind depth.
+    """
+    for i, (y, xs, xe) in enumerate(zip(ys.tolist(), x_start.tolist(), x_end.tolist())):
+        if xs <= xe:
+            a, b, c = planes[i]
+            span = a * np.arange(xs, xe + 1) + (b * y + c)
+            # ties go to the later span, as in painter's order, so that
+            # coplanar faces (Figure8) do not z-fight on rounding noise
+            nearer = span <= depth[y, xs:xe + 1] + 1e-9 * np.abs(span)
+            pixels[y, xs:xe + 1][nearer] = codes[i]
+            depth[y, xs:xe + 1][nearer] = span[nearer]
+            if attributes is not None:
+                attributes[y, xs:xe + 1][nearer] = colors[i]
+
+
+def numpy_splat(pixels, depth, attributes, xs, ys, depths, codes, colors):
+    """
+    Depth-test point samples at in-bounds cells (xs, ys): every cell keeps
+    its nearest sample, found by a scatter-min into depth. Returns the
+    number of pixels written.
+    """
+    flat = ys * depth.shape[1] + xs
+    zbuffer = depth.reshape(-1)
+    np.minimum.at(zbuffer, flat, depths)
+    nearest = depths <= zbuffer[flat]
+    pixels[ys[nearest], xs[nearest]] = codes[nearest]
+    if attributes is not None:
+        attributes[ys[nearest], xs[nearest]] = colors[nearest]
+    return int(np.count_nonzero(nearest))
+
+
+class NumpyKernels:
+    """Raster kernels written with NumPy; always available."""
+
+    name = "numpy"
+    draw_lines = staticmethod(numpy_draw_lines)
+    fill_spans = staticmethod(numpy_fill_spans)
+    fill_spans_depth = staticmethod(numpy_fill_spans_depth)
+    splat = staticmethod(numpy_splat)
+
+
+# Numba takes longer to import than everything else at startup, so its
+# kernels (numba_kernels.py) are only imported when first used
+BACKENDS = ("numpy", "numba") if importlib.util.find_spec("numba") is not None else ("numpy",)
+# compiled kernels when Numba is installed, NumPy otherwise
+DEFAULT_BACKEND = BACKENDS[-1]
+LOADED = {"numpy": NumpyKernels()}
+
+
+def get_kernels(name=None):
+    """
+    The kernel backend called name ('numpy' or 'numba'), by default the
+    fastest installed. If Numba is installed but fails to import (for
+    instance, built for another NumPy version), the default falls back to
+    NumPy; asking for 'numba' by name raises the ImportError instead.
+    """
+    backend = name or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Kernel backend '{backend}' is not available"
+                         + (" (Numba is not installed)." if backend == "numba" else "."))
+    if backend not in LOADED:
+        try:
+            from numba_kernels import NumbaKernels
+        except ImportError:
+            if name is not None:
+                raise
+            return LOADED["numpy"]
+        LOADED[backend] = NumbaKernels()
+    return LOADED[backend]
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class PointLight:
+    """Light at a fixed position; the direction to it varies per face."""
+
+    def __init__(self, position):
+        self.position = np.asarray(position, dtype=float)
+
+    def directions(self, points):
+        """Unit vectors from each of the (F, 3) points towards the light."""
+        to_light = self.position - points
+        return to_light / np.linalg.norm(to_light, axis=1, keepdims=True)
+
+
+class DirectionalLight:
+    """Light infinitely far away, shining from the same direction on every face."""
+
+    def __init__(self, direction):
+        direction = np.asarray(direction, dtype=float)
+        self.direction = direction / np.linalg.norm(direction)
+
+    def directions(self, points):
+        return np.broadcast_to(self.direction, points.shape)
+
+
+def face_normals(vertices, faces):
+    """
+    Unit normals of an (F, k) face array, from the first three vertices of
+    each face. Degenerate faces get a zero normal.
+    """
+    v0, v1, v2 = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    normals = np.cross(v1 - v0, v2 - v0)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+
+
+def face_centers(vertices, faces):
+    """Centroids of an (F, k) face array, ignoring repeated padding vertices."""
+    valid = np.ones(faces.shape, dtype=bool)
+    valid[:, 1:] = faces[:, 1:] != faces[:, :-1]
+    points = vertices[faces] * valid[:, :, None]
+    return points.sum(axis=1) / valid.sum(axis=1, keepdims=True)
+
+
+def face_brightness(normals, centers, light, ambient=0.2):
+    """
+    Lambert plus ambient brightness in [0, 1] for every face at once.
+    normals and centers are (F, 3) arrays in the same (rotated) space as the light.
+    """
+    lambert = np.maximum(np.sum(normals * light.directions(centers), axis=1), 0)
+    return np.minimum(ambient + (1 - ambient) * lambert, 1)
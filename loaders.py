@@ -0,0 +1,201 @@
+import os
+import re
+
+import numpy as np
+
+from mesh import face_edges
+
+# binary STL: 80-byte header, uint32 triangle count, then 50-byte records
+STL_HEADER_SIZE = 84
+STL_RECORD = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attributes', '<u2')])
+
+# OBJ vertex and face lines, and texture and normal references in face
+# vertices ("7/1/3" -> "7")
+OBJ_VERTEX_LINE = re.compile(rb'^v +(.*)$', re.MULTILINE)
+OBJ_FACE_LINE = re.compile(rb'^f +(.*)$', re.MULTILINE)
+OBJ_VERTEX_REFS = re.compile(rb'/\S*')
+
+
+class Model:
+    """
+    A mesh loaded from a file, with the same vertices/edges/faces attributes
+    as the hand-written shapes. Edges are derived from the faces. Faces keep
+    the file's winding, which prepare_mesh uses to cull back faces of
+    closed models; models are never treated as convex.
+    """
+
+    def __init__(self, vertices, faces, name=None):
+        self.name = name
+        self.vertices = np.ascontiguousarray(vertices, dtype=float)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int32)
+        self.edges = face_edges(self.faces)
+
+    def fit(self, size):
+        """Center the model on the origin and scale its bounding sphere to diameter size."""
+        low, high = self.vertices.min(axis=0), self.vertices.max(axis=0)
+        self.vertices -= (low + high) / 2
+        radius = np.linalg.norm(self.vertices, axis=1).max(initial=0)
+        if radius > 0:
+            self.vertices *= size / 2 / radius
+        return self
+
+
+def weld(points):
+    """
+    Merge bitwise-identical points. Returns the unique (N, 3) points and,
+    for every input point, its index into them.
+    """
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    # -0.0 and 0.0 compare equal but differ in their bits
+    points += np.float32(0)
+    if len(points) == 0:
+        return points, np.empty(0, dtype=np.int32)
+    bits = points.view(np.uint32)
+    # sort by (x, y, z) bit patterns with two stable passes on integer keys
+    wide = bits.astype(np.uint64)
+    xy = wide[:, 0] << np.uint64(32) | wide[:, 1]
+    order = np.argsort(bits[:, 2], kind='stable')
+    order = order[np.argsort(xy[order], kind='stable')]
+    ordered = bits[order]
+    first = np.empty(len(order), dtype=bool)
+    first[0] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=first[1:])
+    inverse = np.empty(len(order), dtype=np.int32)
+    inverse[order] = np.cumsum(first) - 1
+    return points[order[first]], inverse
+
+
+def load_stl(path):
+    """
+    Load a binary STL file. The triangle records are memory-mapped rather
+    than read, and shared corners are welded into one vertex.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head = f.read(STL_HEADER_SIZE)
+    if len(head) < STL_HEADER_SIZE:
+        raise ValueError(f"{path} is not a binary STL file.")
+    count = int(np.frombuffer(head, dtype='<u4', count=1, offset=80)[0])
+    if size != STL_HEADER_SIZE + count * STL_RECORD.itemsize:
+        if head.startswith(b'solid'):
+            raise ValueError(f"{path} is an ASCII STL file; only binary STL is supported.")
+        raise ValueError(f"{path} is not a binary STL file.")
+    if count == 0:
+        return Model(np.empty((0, 3)), np.empty((0, 3), dtype=np.int32), os.path.basename(path))
+
+    records = np.memmap(path, dtype=STL_RECORD, mode='r', offset=STL_HEADER_SIZE, shape=(count,))
+    vertices, inverse = weld(records['vertices'].reshape(-1, 3))
+    return Model(vertices, inverse.reshape(-1, 3), os.path.basename(path))
+
+
+def load_obj(path, chunk_size=1 << 22):
+    """
+    Load the vertices and faces of a Wavefront OBJ file. The file is read in
+    chunks of chunk_size bytes, so memory holds one chunk of text at a time
+    besides the parsed arrays. Polygons keep their vertex count and are
+    padded like the built-in shapes' faces.
+    """
+    vertex_chunks = []
+    index_chunks = []
+    count_chunks = []
+    vertex_count = 0
+    rest = b''
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            data = rest + chunk
+            if chunk:
+                # hold back the incomplete last line for the next chunk
+                cut = data.rfind(b'\n') + 1
+                data, rest = data[:cut], data[cut:]
+            vertices, indices, counts = parse_obj_chunk(data.replace(b'\t', b' '), vertex_count)
+            vertex_chunks.append(vertices)
+            index_chunks.append(indices)
+            count_chunks.append(counts)
+            vertex_count += len(vertices)
+            if not chunk:
+                break
+
+    vertices = np.concatenate(vertex_chunks)
+    indices = np.concatenate(index_chunks)
+    counts = np.concatenate(count_chunks)
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(vertices)):
+        raise ValueError(f"{path} has face indices outside its vertex list.")
+    # points and lines written as faces cannot be filled
+    polygons = counts >= 3
+    indices, counts = indices[np.repeat(polygons, counts)], counts[polygons]
+    return Model(vertices, pad_polygons(indices, counts), os.path.basename(path))
+
+
+def parse_obj_chunk(data, vertex_count):
+    """
+    Parse the vertex and face lines of a chunk of whole OBJ lines.
+    Returns (vertices (N, 3), flat 0-based face indices, vertices per face).
+    vertex_count is the number of vertices defined before the chunk, for
+    resolving negative (relative) indices.
+    """
+    vertices = np.empty((0, 3))
+    rows = OBJ_VERTEX_LINE.findall(data)
+    if rows:
+        tokens = b' '.join(rows).split()
+        if len(tokens) == 3 * len(rows):
+            vertices = np.array(tokens).reshape(-1, 3).astype(float)
+        else:
+            # optional w or vertex colors: keep only x, y and z
+            vertices = np.array([row.split()[:3] for row in rows], dtype=float)
+
+    indices = np.empty(0, dtype=np.int64)
+    counts = np.empty(0, dtype=np.int64)
+    rows = OBJ_FACE_LINE.findall(data)
+    if rows:
+        tokens = np.array(OBJ_VERTEX_REFS.sub(b'', b'f ' + b' f '.join(rows)).split())
+        markers = np.flatnonzero(tokens == b'f')
+        counts = np.diff(np.append(markers, len(tokens))) - 1
+        keep = np.ones(len(tokens), dtype=bool)
+        keep[markers] = False
+        indices = tokens[keep].astype(np.int64)
+        if indices.min() < 0:
+            # negative indices count back from the vertices defined so far
+            bases = np.repeat(vertex_count + vertices_before_faces(data), counts)
+            indices = np.where(indices < 0, bases + indices + 1, indices)
+        indices -= 1
+    return vertices, indices, counts
+
+
+def vertices_before_faces(data):
+    """For every face line in data, the number of vertex lines before it."""
+    text = np.frombuffer(data, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(text[:-1] == ord('\n')) + 1))
+    starts = starts[starts < len(text) - 1]
+    is_vertex = (text[starts] == ord('v')) & (text[starts + 1] == ord(' '))
+    is_face = (text[starts] == ord('f')) & (text[starts + 1] == ord(' '))
+    return np.cumsum(is_vertex)[is_face]
+
+
+def pad_polygons(indices, counts):
+    """
+    Build a padded (F, k) face array from flat polygon indices and their
+    vertex counts, repeating each polygon's last vertex as padding.
+    """
+    if len(counts) == 0:
+        return np.empty((0, 3), dtype=np.int32)
+    k = int(counts.max())
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    faces = np.repeat(indices[ends - 1][:, None], k, axis=1)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    columns = np.arange(len(indices)) - np.repeat(starts, counts)
+    faces[rows, columns] = indices
+    return faces.astype(np.int32)
+
+
+def load_model(path, size=8):
+    """Load an .stl or .obj file by extension and fit it to the given size."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.stl':
+        model = load_stl(path)
+    elif extension == '.obj':
+        model = load_obj(path)
+    else:
+        raise ValueError(f"Unsupported model format: {extension or path}")
+    return model.fit(size)
@@ -0,0 +1,68 @@
+import bisect
+
+
+# tessellation levels (segments) kept for each parametric shape
+LOD_LEVELS = {
+    "sphere": [6, 9, 12, 18, 24, 36, 48, 64, 96, 128],
+    "donut": [8, 12, 16, 24, 30, 40, 60, 80, 120, 160],
+}
+
+
+class LODShape:
+    """
+    Several tessellations of one parametric shape, with a per-frame choice
+    between them.
+
+    The level is picked so that mesh edges project to about edge_cells
+    cells on screen: coarse meshes for small shapes, dense ones for large
+    shapes, for roughly constant cost per screen area. Hysteresis keeps the
+    level steady while the projected size hovers near a boundary, and a
+    frame-time budget caps the level while frames run over it.
+    """
+
+    def __init__(self, build, levels, edge_cells=3.0, budget=None, hysteresis=0.25):
+        self.build = build
+        self.levels = sorted(levels)
+        self.edge_cells = edge_cells
+        self.budget = budget
+        self.hysteresis = hysteresis
+        self.meshes = {}
+        self.level = 0
+        # highest level allowed by the frame-time budget
+        self.cap = len(self.levels) - 1
+
+    def mesh(self, level):
+        """The mesh for a level, built on first use."""
+        segments = self.levels[level]
+        if segments not in self.meshes:
+            self.meshes[segments] = self.build(segments)
+        return self.meshes[segments]
+
+    def edge_ratio(self, level):
+        """Mean edge length of a level relative to its bounding radius."""
+        mesh = self.mesh(level)
+        return mesh.mean_edge_length / mesh.radius
+
+    def target_segments(self, radius_cells):
+        """Segments needed for edges of edge_cells cells at this screen radius."""
+        # edge length shrinks in proportion to the number of segments
+        coarsest = self.levels[0]
+        return coarsest * self.edge_ratio(0) * radius_cells / self.edge_cells
+
+    def select(self, radius_cells, frame_time=None):
+        """Pick the level for a frame and return its mesh."""
+        if self.budget is not None and frame_time is not None:
+            if frame_time > self.budget and self.cap > 0:
+                self.cap -= 1
+            elif frame_time < self.budget / 2 and self.cap < len(self.levels) - 1:
+                self.cap += 1
+
+        target = self.target_segments(radius_cells)
+        wanted = min(bisect.bisect_left(self.levels, target), len(self.levels) - 1)
+        current = self.levels[self.level]
+        if wanted > self.level and target > current * (1 + self.hysteresis):
+            self.level = wanted
+        elif wanted < self.level and target < self.levels[self.level - 1] * (1 - self.hysteresis):
+            self.level = wanted
+        self.level = min(self.level, self.cap)
+        return self.mesh(self.level)
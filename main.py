@@ -1,207 +1,93 @@
-import numpy as np
-import time
-import os
-import math
-from cube import Cube
-from donut import Donut
-from figure8 import Figure8
-from pyramid import Pyramid
-from sphere import Sphere
-from tetrahedron import Tetrahedron
-from octahedron import Octahedron
-
 import argparse
+import math
+import os
+import signal
+import time
 
-class ASCIICanvas3D:
-    def __init__(self, width, height, background=' '):
-        self.width = width
-        self.height = height
-        self.background = background
-        self.canvas = np.full((height, width), background, dtype='<U1')
-    
-    def clear(self):
-        self.canvas[:] = self.background
-    
-    def display(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        for row in self.canvas:
-            print(''.join(row))
-    
-    def draw_line(self, x0, y0, x1, y1, char='#'):
-        """Draw a line from (x0, y0) to (x1, y1) using Bresenham's algorithm."""
-        x0 = int(round(x0))
-        y0 = int(round(y0))
-        x1 = int(round(x1))
-        y1 = int(round(y1))
-        dx = abs(x1 - x0)
-        dy = abs(y1 - y0)
-        sx = 1 if x0 < x1 else -1
-        sy = 1 if y0 < y1 else -1
-        err = dx - dy
-        
-        while True:
-            if 0 <= x0 < self.width and 0 <= y0 < self.height:
-                self.canvas[y0, x0] = char
-            if x0 == x1 and y0 == y1:
-                break
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x0 += sx
-            if e2 < dx:
-                err += dx
-                y0 += sy
-
-
-
-def project_vertex(vertex, screen_width, screen_height, scale=4, offset=(20,-20)):
-    """
-    Project a 3D vertex onto 2D screen coordinates using orthographic projection.
-    """
-    x, y, z = vertex
-    # orthographic projection: ignore z-coordinate
-    x_proj = x * scale + offset[0]
-    y_proj = y * scale + offset[1]
-    # invert y-axis for correct display
-    y_proj = -y_proj
-    return (x_proj, y_proj)
-
-def perspective_projection(vertex, screen_width, screen_height, fov=200, viewer_distance=45):
-    """
-    Project a 3D vertex onto 2D screen coordinates using perspective projection.
-    """
-    x, y, z = vertex
-    factor = fov / (viewer_distance + z)
-    x_proj = x * factor + screen_width / 2
-    y_proj = -y * factor + screen_height / 2
-    return (x_proj, y_proj)
-
-
-def rotate_vertex(vertex, angle_x, angle_y, angle_z):
-    x, y, z = vertex
-    # rotation around X-axis
-    cos_x, sin_x = math.cos(angle_x), math.sin(angle_x)
-    y, z = y * cos_x - z * sin_x, y * sin_x + z * cos_x
-    # rotation around Y-axis
-    cos_y, sin_y = math.cos(angle_y), math.sin(angle_y)
-    x, z = x * cos_y + z * sin_y, -x * sin_y + z * cos_y
-    # rotation around Z-axis
-    cos_z, sin_z = math.cos(angle_z), math.sin(angle_z)
-    x, y = x * cos_z - y * sin_z, x * sin_z + y * cos_z
-    return (x, y, z)
-
-def draw_face(canvas, points, char):
-    num_points = len(points)
-    for i in range(num_points):
-        x0, y0 = points[i]
-        x1, y1 = points[(i + 1) % num_points]
-        canvas.draw_line(x0, y0, x1, y1, char=char)
-
-def fill_polygon(canvas, vertices, char):
+from anim import AnimationReader, AnimationWriter
+from color import COLOR_MODES, Palette
+from instrument import NULL_PROFILER, Profiler
+from kernels import BACKENDS, get_kernels
+from loaders import load_model
+from lod import LODShape, LOD_LEVELS
+from mesh import prepare_mesh
+from pacing import FrameScheduler
+from pipeline import FrameRing, start_present_thread
+from renderer import (AVAILABLE_SHAPES, DIRECTIONAL_LIGHT, MODES, POINT_LIGHT, ROTATION_SPEED, SHAPE_TYPES,
+                      SHAPES, Renderer, supports_mode)
+from scene import scatter
+from transform import frame_matrix, screen_radius
+
+def animation_period(fps):
     """
-    Fill a polygon on the canvas given its vertices and fill character.
-    Uses the Scanline Fill Algorithm.
+    Number of frames in one full turn at fps. The angle step is rounded so
+    that the last frame leads exactly back into the first.
     """
-    # extract x and y coordinates from vertices
-    x_coords = [int(round(x)) for x, y in vertices]
-    y_coords = [int(round(y)) for x, y in vertices]
-    num_vertices = len(vertices)
-
-    # find the bounding box of the polygon
-    min_y = max(min(y_coords), 0)
-    max_y = min(max(y_coords), canvas.height - 1)
-
-    # create an edge table
-    edge_table = []
-    for i in range(num_vertices):
-        x0, y0 = x_coords[i], y_coords[i]
-        x1, y1 = x_coords[(i + 1) % num_vertices], y_coords[(i + 1) % num_vertices]
-
-        if y0 == y1:
-            continue  # Ignore horizontal edges
-
-        if y0 > y1:
-            x0, y0, x1, y1 = x1, y1, x0, y0  # swap to ensure y0 <= y1
-
-        inverse_slope = (x1 - x0) / (y1 - y0)
-        edge_table.append({
-            'y_min': y0,
-            'y_max': y1,
-            'x_at_y_min': x0,
-            'inverse_slope': inverse_slope
-        })
-
-    # sort the edge table by y_min
-    edge_table.sort(key=lambda e: e['y_min'])
-
-    # scanline fill
-    y = min_y
-    active_edges = []
-    while y <= max_y:
-        # add edges where y == y_min to active edges
-        for edge in edge_table:
-            if edge['y_min'] == y:
-                active_edges.append(edge)
-
-        # remove edges where y == y_max from active edges
-        active_edges = [e for e in active_edges if e['y_max'] != y]
-
-        # sort active edges by x_at_y_min
-        active_edges.sort(key=lambda e: e['x_at_y_min'])
-
-       # fill between pairs of intersections
-        i = 0
-        while i < len(active_edges) - 1:
-            x_start = active_edges[i]['x_at_y_min']
-            x_end = active_edges[i + 1]['x_at_y_min']
-
-            x_start = int(round(x_start))
-            x_end = int(round(x_end))
-
-            # Clip to canvas bounds
-            x_start = max(x_start, 0)
-            x_end = min(x_end, canvas.width - 1)
-
-            for x in range(x_start, x_end + 1):
-                if 0 <= x < canvas.width and 0 <= y < canvas.height:
-                    canvas.canvas[y, x] = char
-            i += 2  # move to the next pair
-
-        # increment x_at_y_min for each active edge
-        for edge in active_edges:
-            edge['x_at_y_min'] += edge['inverse_slope']
-
-        y += 1
-        
-def instantiate_shape(shape_name):
-    if shape_name == "cube":
-        return Cube(center=(0, 0, 0), size=5)
-    elif shape_name == "pyramid":
-        return Pyramid(center=(0, 0, 0), size=5)
-    elif shape_name == "tetrahedron":
-        return Tetrahedron(center=(0, 0, 0), size=5)
-    elif shape_name == "octahedron":
-        return Octahedron(center=(0, 0, 0), size=5)
-    elif shape_name == "sphere":
-        return Sphere(center=(0, 0, 0), radius=5, segments=12, rings=12)
-    else:
-        raise ValueError(f"Invalid shape: {shape_name}")
+    return max(1, round(2 * math.pi * fps / ROTATION_SPEED))
+
+def animation_angle(frame, frames):
+    """Rotation angle of a frame in a looping animation of the given length."""
+    return 2 * math.pi * frame / frames
+
+def record_animation(path, renderer, shape, fps, encoding='raw'):
+    """Render one period of the rotation into an animation file; returns the frame count."""
+    frames = animation_period(fps)
+    canvas = renderer.canvas
+    with AnimationWriter(path, canvas.width, canvas.height, fps, encoding) as writer:
+        for frame in range(frames):
+            angle = animation_angle(frame, frames)
+            renderer.draw_angles(shape, (angle, angle, angle))
+            writer.write(canvas.pixels)
+    return frames
+
+def play_animation(reader, presenter, scheduler, stats=False):
+    """Loop a recorded animation on the terminal until interrupted."""
+    while True:
+        for frame in reader:
+            presented = scheduler.should_present()
+            if presented:
+                presenter.present(frame, scheduler.stats_line() if stats else None)
+            scheduler.end_frame(presented)
+
+def terminal_canvas_size():
+    """Canvas size that fills the terminal, less one row for the footer; 80x40 without a terminal."""
+    try:
+        columns, lines = os.get_terminal_size()
+    except OSError:
+        return 80, 40
+    return max(columns, 1), max(lines - 1, 1)
 
 def main():
     parser = argparse.ArgumentParser(description="Render 3D shapes.")
     parser.add_argument(
         "--shape",
         type=str,
-        choices=["cube", "donut", "figure8", "pyramid", "sphere", "tetrahedron", "octahedron"],
+        choices=list(SHAPE_TYPES),
         default="cube",
         help="Shape to render.",
     )
+    parser.add_argument(
+        "--model",
+        type=str,
+        metavar="FILE",
+        help="Render a binary STL or Wavefront OBJ model instead of --shape.",
+    )
     parser.add_argument(
         "--fps",
         type=int,
         default=30,
         help="Frames per second.",
     )
+    parser.add_argument(
+        "--width",
+        type=int,
+        help="Canvas width in characters (default: the terminal width, following resizes).",
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        help="Canvas height in characters (default: the terminal height less one row).",
+    )
     parser.add_argument(
         '--projection',
         type=str,
@@ -212,148 +98,319 @@ def main():
     parser.add_argument(
         "--mode",
         type=str,
-        choices=["wireframe", "solid"],
+        choices=MODES,
         default="wireframe",
-        help="Rendering mode: 'wireframe' or 'solid'.",
+        help="Rendering mode: 'wireframe', 'solid' (filled faces) or 'surface' "
+             "(the sampled analytic surface of Sphere and Donut).",
+    )
+    parser.add_argument(
+        "--light",
+        type=str,
+        choices=["point", "directional"],
+        default="point",
+        help="Light used for shading in solid and surface modes.",
+    )
+    parser.add_argument(
+        "--color",
+        type=str,
+        choices=["off", *COLOR_MODES],
+        default="off",
+        help="Color the shading with 256-color or 24-bit truecolor escape sequences.",
+    )
+    parser.add_argument(
+        "--kernels",
+        type=str,
+        choices=["numpy", "numba"],
+        default=None,
+        help="Raster kernel backend (default: numba if installed, else numpy); "
+             "numpy starts faster, since loading Numba takes about 0.4 s.",
+    )
+    parser.add_argument(
+        "--lod",
+        action="store_true",
+        help="Choose the Sphere/Donut tessellation each frame from its size on screen.",
+    )
+    parser.add_argument(
+        "--lod-edge-cells",
+        type=float,
+        default=3.0,
+        help="Target on-screen edge length, in cells, for --lod.",
+    )
+    parser.add_argument(
+        "--frame-budget",
+        type=float,
+        default=None,
+        help="Render time budget per frame in ms for --lod (default: one frame at --fps).",
+    )
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=0,
+        help="Render a scene of this many instances of the shape scattered in front of the viewer.",
     )
     parser.add_argument(
         "--screensaver",
         action="store_true",
         help="Enable screensaver mode to cycle through different shapes.",
     )
+    parser.add_argument(
+        "--pipeline",
+        type=str,
+        choices=["off", "block", "drop"],
+        default="off",
+        help="Present frames on a separate thread while the next one renders; "
+             "'block' waits for a slow terminal, 'drop' discards the oldest unpresented frame.",
+    )
+    parser.add_argument(
+        "--buffers",
+        type=int,
+        default=3,
+        help="Number of canvases in the pipeline ring (2 = double, 3 = triple buffering).",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        metavar="FILE",
+        help="Render one full rotation of the shape to FILE and exit.",
+    )
+    parser.add_argument(
+        "--encoding",
+        type=str,
+        choices=["raw", "rle", "delta"],
+        default="raw",
+        help="Frame encoding for --record.",
+    )
+    parser.add_argument(
+        "--play",
+        type=str,
+        metavar="FILE",
+        help="Play an animation recorded with --record.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="OUT.json",
+        help="Record per-stage spans and counters to a Chrome trace file and show them below the canvas.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show achieved fps and dropped frames below the canvas.",
+    )
     args = parser.parse_args()
-    FRAME_DURATION = 1 / args.fps
+    if args.model and args.screensaver:
+        parser.error("--model cannot be combined with --screensaver.")
+    if args.instances and args.mode == 'surface':
+        parser.error("--instances cannot be combined with --mode surface.")
+    if args.record and (args.instances or args.color != 'off'):
+        parser.error("--record stores single uncolored shapes; it cannot be combined with "
+                     "--instances or --color.")
+    if args.buffers < 2:
+        parser.error("--buffers needs at least 2 canvases.")
+    if args.kernels is not None and args.kernels not in BACKENDS:
+        parser.error("--kernels numba needs Numba to be installed.")
+
+    reader = None
+    if args.play:
+        try:
+            reader = AnimationReader(args.play)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    else:
+        # load the kernel backend now, so an unusable --kernels numba is a usage error
+        try:
+            get_kernels(args.kernels)
+        except ImportError as e:
+            parser.error(f"--kernels {args.kernels}: {e}")
+    # playback runs at the frame rate the animation was recorded with
+    scheduler = FrameScheduler(reader.fps if reader is not None else args.fps)
+    light = POINT_LIGHT if args.light == 'point' else DIRECTIONAL_LIGHT
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    palette = Palette(args.color) if args.color != 'off' else None
 
     ##### Canvas Dimensions #####
-    width = 80
-    height = 40
-    canvas = ASCIICanvas3D(width, height, background=' ')
-
-
-    available_shapes = ["cube", "pyramid", "tetrahedron", "octahedron", "sphere", "donut"]
-
-    def instantiate_shape(shape_name):
-        if shape_name == "cube":
-            return Cube(center=(0, 0, 0), size=5)
-        elif shape_name == "donut":
-            return Donut(R=3, r=1, segments=30)
-        elif shape_name == "figure8":
-            return Figure8(center=(0, 0, 0), size=8)
-        elif shape_name == "pyramid":
-            return Pyramid(center=(0, 0, 0), size=5)
-        elif shape_name == "sphere":
-            return Sphere(center=(0, 0, 0), radius=4, segments=9, rings=9)
-        elif shape_name == "tetrahedron":
-            return Tetrahedron(center=(0, 0, 0), size=6)
-        elif shape_name == "octahedron":
-            return Octahedron(center=(0, 0, 0), size=8)
-        else:
-            raise ValueError(f"Invalid shape: {shape_name}")
+    # sized to the terminal unless given; shapes are scaled to fit it
+    columns, lines = terminal_canvas_size()
+    width = args.width or columns
+    height = args.height or lines
+    renderer = Renderer(width, height, args.mode, args.projection, light, palette=palette,
+                        backend=args.kernels)
+    canvas = renderer.canvas
+    presenter = canvas.presenter
+
+    # pipelined mode: a ring of canvases sharing one presenter, drained by a present thread
+    ring = None
+    if args.pipeline != 'off':
+        canvases = [canvas] + [renderer.new_canvas() for _ in range(args.buffers - 1)]
+        for c in canvases:
+            c.presenter = presenter
+        ring = FrameRing(canvases, policy=args.pipeline)
+        present_thread = start_present_thread(ring, profiler)
 
     # screensaver preparation
     current_shape_index = 0
     shape_display_duration = 5  # Duration in seconds
-    last_switch_time = time.time()
+    last_switch_time = 0
 
     # first shape instantiation
     if args.screensaver:
-        shape_name = available_shapes[current_shape_index]
-        shape = instantiate_shape(shape_name)
+        shape_name = AVAILABLE_SHAPES[current_shape_index]
     else:
-        shape = instantiate_shape(args.shape)
-
-    # rotation angles
-    angle_x, angle_y, angle_z = 0, 0, 0
-    
-    project = project_vertex if args.projection == 'o' else perspective_projection
-
-    ###### Light position ######
-    light_position = np.array([0, 20, -30])
-
-    # ASCII characters representing different brightness levels
-    ascii_chars = [' ', '.', ':', '-', '=', '+', '*', '#', '%', '@']
-
-    def get_ascii_char(brightness):
-        index = int(brightness * (len(ascii_chars) - 1))
-        return ascii_chars[index]
-
+        shape_name = args.shape
+    with profiler.span("instantiate"):
+        if args.model:
+            try:
+                shape = prepare_mesh(load_model(args.model))
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+            shape_name = shape.name
+        else:
+            shape = SHAPES.get(shape_name)
+    scene = scatter([shape], args.instances) if args.instances else None
+
+    if args.record:
+        if not supports_mode(shape, args.mode):
+            print(f"The shape '{shape_name}' does not support {args.mode} rendering.")
+            return
+        frames = record_animation(args.record, renderer, shape, args.fps, args.encoding)
+        print(f"Recorded {frames} frames to {args.record}.")
+        return
+
+    # follow terminal resizes (SIGWINCH) when the size was not given; the
+    # pipeline ring keeps its canvases at the starting size
+    resized = False
+    follow_terminal = not (args.width or args.height) and ring is None and hasattr(signal, 'SIGWINCH')
+
+    def on_resize(signum, frame):
+        nonlocal resized
+        resized = True
+
+    if follow_terminal:
+        signal.signal(signal.SIGWINCH, on_resize)
+
+    # level-of-detail sets for the parametric shapes, built on first use
+    lods = {}
+    lod_budget = args.frame_budget / 1000 if args.frame_budget else 1 / args.fps
+    render_time = None
+
+    def build_level(name, segments):
+        with profiler.span("instantiate"):
+            return SHAPES.get(name, segments=segments)
+
+    def shape_lod(name):
+        if not args.lod or name not in LOD_LEVELS:
+            return None
+        if name not in lods:
+            lods[name] = LODShape(lambda segments: build_level(name, segments),
+                                  LOD_LEVELS[name], args.lod_edge_cells, lod_budget)
+        return lods[name]
+
+    def draw(target, frame_shape, t):
+        if scene is not None:
+            renderer.draw_scene(scene, t, target, profiler=profiler)
+        else:
+            renderer.draw(frame_shape, t, target, profiler=profiler)
+
+    def frame_footer(stats_line):
+        lines = []
+        if args.stats:
+            lines.append(stats_line)
+        if profiler.enabled:
+            lines.append(profiler.hud())
+        return "  |  ".join(lines) if lines else None
+
+    # an untimed first frame loads the compiled kernels from their cache,
+    # which would otherwise put the paced loop behind from the start
+    if reader is None and supports_mode(shape, args.mode):
+        draw(canvas, shape, 0)
+
+    # printed once the screen has been cleared on exit
+    message = None
     try:
-        while True:
-            current_time = time.time()
-            # check if screensaver mode is enabled and if it's time to switch shapes
-            if args.screensaver and (current_time - last_switch_time >= shape_display_duration):
-                # wwitch to the next shape
-                current_shape_index = (current_shape_index + 1) % len(available_shapes)
-                shape_name = available_shapes[current_shape_index]
-                shape = instantiate_shape(shape_name)
-                last_switch_time = current_time  # Reset the switch time
-
-            canvas.clear()
-
-            # rotate verticesand project them
-            rotated_vertices = [rotate_vertex(v, angle_x, angle_y, angle_z) for v in shape.vertices]
-            projected_vertices = []
-            for vertex in rotated_vertices:
-                x, y = project(vertex, width, height)
-                projected_vertices.append((x, y))
-
-            if args.mode == 'wireframe':
-                # Draw edges
-                for edge in shape.edges:
-                    start, end = edge
-                    x0, y0 = projected_vertices[start]
-                    x1, y1 = projected_vertices[end]
-                    canvas.draw_line(x0, y0, x1, y1, char='#')
-            elif args.mode == 'solid':
-                # ensure the shape supports solid rendering
-                if not hasattr(shape, 'faces'):
-                    print(f"The shape '{shape_name}' does not support solid rendering.")
+        scheduler.start()
+        if reader is not None:
+            play_animation(reader, presenter, scheduler, args.stats)
+        else:
+            while True:
+                current_time = scheduler.elapsed()
+                # check if screensaver mode is enabled and if it's time to switch shapes
+                if args.screensaver and (current_time - last_switch_time >= shape_display_duration):
+                    # wwitch to the next shape
+                    current_shape_index = (current_shape_index + 1) % len(AVAILABLE_SHAPES)
+                    shape_name = AVAILABLE_SHAPES[current_shape_index]
+                    with profiler.span("instantiate"):
+                        shape = SHAPES.get(shape_name)
+                    if scene is not None:
+                        scene = scatter([shape], args.instances)
+                    last_switch_time = current_time  # Reset the switch time
+
+                # reallocate the canvas only if the terminal size really changed
+                if resized:
+                    resized = False
+                    width, height = terminal_canvas_size()
+                    if renderer.resize(width, height):
+                        canvas = renderer.canvas
+
+                # ensure the shape supports the rendering mode
+                if not supports_mode(shape, args.mode):
+                    message = f"The shape '{shape_name}' does not support {args.mode} rendering."
                     break
 
-                ambient = 0.2 # ambient light level (0 to 1)
-
-                # draw and shade faces
-                for face in shape.faces:
-                    face_vertices = [rotated_vertices[i] for i in face]
-
-                    # calculate face normal
-                    v0, v1, v2 = face_vertices[:3]
-                    edge1 = np.array(v1) - np.array(v0)
-                    edge2 = np.array(v2) - np.array(v0)
-                    normal = np.cross(edge1, edge2)
-                    normal = normal / np.linalg.norm(normal)
-
-                    # calculate brightness using the light direction
-                    to_light = light_position - np.array(v0)
-                    to_light = to_light / np.linalg.norm(to_light)
-                    brightness = np.dot(normal, to_light)
-                    brightness = max(0, brightness)  # Clamp to [0, 1]
-
-                    # add ambient light component
-                    brightness = ambient + (1 - ambient) * brightness
-                    brightness = min(1, brightness)  # Ensure brightness does not exceed 1
-
-                    # map brightness to ASCII char
-                    char = get_ascii_char(brightness)
-
-                    # project face vertices and fill the face
-                    face_projected = [project(v, width, height) for v in face_vertices]
-                    fill_polygon(canvas, face_projected, char)
-
-            canvas.display()
-
-            # Update rotation angles
-            angle_x += 0.02
-            angle_y += 0.02
-            angle_z += 0.02
-
-            # frame rate
-            time.sleep(FRAME_DURATION)
+                # pick a tessellation level from the shape's projected size;
+                # rotation follows elapsed time, not the number of frames
+                frame_shape = shape
+                lod = shape_lod(shape_name)
+                if lod is not None and scene is None:
+                    center = frame_matrix(*renderer.angles(current_time)) @ shape.center
+                    frame_shape = lod.select(screen_radius(center, shape.radius, args.projection, zoom=renderer.zoom),
+                                             render_time)
+
+                footer = None
+                if ring is None:
+                    render_start = time.perf_counter()
+                    draw(canvas, frame_shape, current_time)
+                    render_time = time.perf_counter() - render_start
+
+                    # drop the present when behind so the animation keeps its pace
+                    presented = scheduler.should_present()
+                    if presented:
+                        footer = frame_footer(scheduler.stats_line())
+                        with profiler.span("present"):
+                            canvas.display(footer)
+                        profiler.count("bytes_emitted", presenter.last_frame_bytes)
+                else:
+                    # render into a free canvas while the present thread writes the last one
+                    canvas = ring.acquire()
+                    render_start = time.perf_counter()
+                    draw(canvas, frame_shape, current_time)
+                    render_time = time.perf_counter() - render_start
+                    footer = frame_footer(f"{scheduler.stats_line()}  {ring.dropped} dropped in pipeline")
+                    ring.publish(canvas, footer)
+                    presented = True
+                profiler.end_frame()
+                with profiler.span("wait"):
+                    scheduler.end_frame(presented)
     except KeyboardInterrupt:
-        print("\nRendering stopped.")
+        pass
     finally:
+        if ring is not None:
+            ring.close()
+            present_thread.join()
         os.system('cls' if os.name == 'nt' else 'clear')
         print("\033[?25h", end="")
+        if profiler.enabled:
+            profiler.save(args.profile)
+
+    if message is None:
+        dropped = scheduler.frames_dropped + (ring.dropped if ring is not None else 0)
+        message = "Rendering stopped"
+        if presenter.frames:
+            message += (f" ({presenter.total_bytes / presenter.frames:.0f} bytes/frame, "
+                        f"{dropped} frames dropped)")
+        message += "."
+    if profiler.enabled:
+        message += f" Profile of {profiler.frame} frames written to {args.profile}."
+    print(message)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
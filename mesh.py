@@ -0,0 +1,225 @@
+import numpy as np
+
+from lighting import face_normals, face_centers
+
+
+def pad_faces(faces):
+    """
+    Pack faces into an (F, k) int32 array, k being the largest face size.
+    Shorter faces are padded by repeating their last vertex; the repeated
+    vertex adds only a zero-length edge, so fillers and normals (taken from
+    the first three vertices) need no special case.
+    """
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        return np.ascontiguousarray(faces, dtype=np.int32)
+    faces = [tuple(face) for face in faces]
+    if not faces:
+        return np.empty((0, 3), dtype=np.int32)
+    k = max(len(face) for face in faces)
+    padded = np.empty((len(faces), k), dtype=np.int32)
+    for row, face in zip(padded, faces):
+        row[:len(face)] = face
+        row[len(face):] = face[-1]
+    return padded
+
+
+def face_edges(faces):
+    """
+    Unique undirected edges of an (F, k) padded face array, as (E, 2) int32
+    sorted by (low, high) vertex. Zero-length edges from padding are dropped.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    if faces.size == 0:
+        return np.empty((0, 2), dtype=np.int32)
+    a = faces.ravel()
+    b = np.roll(faces, -1, axis=1).ravel()
+    keep = a != b
+    low, high = np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])
+    # one int64 key per edge makes deduplication a sort of a 1-D array
+    stride = int(faces.max()) + 1
+    keys = np.sort(low * stride + high)
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    edges = np.empty((len(keys), 2), dtype=np.int32)
+    edges[:, 0], edges[:, 1] = np.divmod(keys, stride)
+    return edges
+
+
+def first_equal_rows(rows):
+    """For every row of a 2-D integer array, the index of the first row equal to it."""
+    first = np.arange(len(rows))
+    if len(rows) == 0:
+        return first
+    # lexsort is stable, so each run of equal rows starts with the earliest
+    order = np.lexsort(rows.T[::-1])
+    ordered = rows[order]
+    starts = np.ones(len(rows), dtype=bool)
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=starts[1:])
+    first[order] = order[starts][np.cumsum(starts) - 1]
+    return first
+
+
+def weld_vertices(vertices, tolerance):
+    """
+    Merge vertices that round to the same point on a grid of the given
+    spacing. Returns, for every vertex, the index of the first vertex it
+    was merged with, so merged vertices keep that vertex's exact position.
+    """
+    return first_equal_rows(np.round(vertices / tolerance).astype(np.int64))
+
+
+def compact_faces(faces):
+    """
+    Drop repeated consecutive vertices (such as two corners welded into
+    one) from an (F, k) padded face array and re-pad it. Returns the faces
+    and the number of distinct vertices of each.
+    """
+    keep = np.ones(faces.shape, dtype=bool)
+    keep[:, 1:] = faces[:, 1:] != faces[:, :-1]
+    # move the kept vertices to the front, in order
+    faces = np.take_along_axis(faces, np.argsort(~keep, axis=1, kind='stable'), axis=1)
+    counts = keep.sum(axis=1)
+    # a polygon that closes on its first vertex repeats it once at the end
+    counts -= (counts > 1) & (faces[np.arange(len(faces)), counts - 1] == faces[:, 0])
+    columns = np.minimum(np.arange(faces.shape[1]), counts[:, None] - 1)
+    return np.take_along_axis(faces, columns, axis=1), counts
+
+
+def optimize_mesh(shape, tolerance=1e-6):
+    """
+    Remove redundant geometry from a shape in place and return how much was
+    removed, as a dict of vertex, edge and face counts.
+
+    Vertices closer than about tolerance are welded, and vertices no edge
+    or face uses are dropped. Zero-length and repeated edges, faces with
+    fewer than three distinct vertices and repeated faces (the same cycle
+    of vertices in the same winding) are removed. Vertices are then
+    renumbered in the order faces and edges first use them and edges are
+    sorted, so each frame gathers vertices close to each other in memory.
+    Faces keep their order and edges their direction, so the rendered
+    frames are unchanged.
+    """
+    vertices = np.ascontiguousarray(shape.vertices, dtype=float).reshape(-1, 3)
+    edges = np.ascontiguousarray(shape.edges, dtype=np.int64).reshape(-1, 2)
+    has_faces = hasattr(shape, 'faces')
+    faces = pad_faces(shape.faces).astype(np.int64) if has_faces else np.empty((0, 3), dtype=np.int64)
+    removed = {'vertices': len(vertices), 'edges': len(edges), 'faces': len(faces)}
+
+    merged = weld_vertices(vertices, tolerance)
+    edges, faces = merged[edges], merged[faces]
+
+    faces, counts = compact_faces(faces)
+    faces, counts = faces[counts >= 3], counts[counts >= 3]
+    if len(faces):
+        # rotate each face to start at its lowest vertex, keeping the winding
+        k = faces.shape[1]
+        start = np.where(np.arange(k) < counts[:, None], faces, faces.max() + 1).argmin(axis=1)
+        columns = (start[:, None] + np.arange(k)) % counts[:, None]
+        columns = np.where(np.arange(k) < counts[:, None], columns, (start + counts - 1)[:, None] % counts[:, None])
+        canonical = np.take_along_axis(faces, columns, axis=1)
+        faces = faces[first_equal_rows(canonical) == np.arange(len(faces))]
+
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    undirected = np.sort(edges, axis=1)
+    edges = edges[first_equal_rows(undirected) == np.arange(len(edges))]
+
+    # renumber the used vertices in order of first use
+    refs = np.concatenate((faces.ravel(), edges.ravel()))
+    first_use = np.full(len(vertices), len(refs))
+    np.minimum.at(first_use, refs, np.arange(len(refs)))
+    order = np.argsort(first_use, kind='stable')[:np.count_nonzero(first_use < len(refs))]
+    renumber = np.empty(len(vertices), dtype=np.int64)
+    renumber[order] = np.arange(len(order))
+    edges, faces = renumber[edges], renumber[faces]
+    edges = edges[np.lexsort((edges.max(axis=1), edges.min(axis=1)))]
+
+    shape.vertices = vertices[order]
+    shape.edges = edges.astype(np.int32)
+    if has_faces:
+        shape.faces = faces.astype(np.int32)
+    removed['vertices'] -= len(shape.vertices)
+    removed['edges'] -= len(shape.edges)
+    removed['faces'] -= len(faces)
+    return removed
+
+
+def closed_surface(faces):
+    """
+    Whether padded faces form closed surfaces with consistent winding:
+    every directed edge is used by one face and its reverse by another.
+    Back faces of such a mesh are always hidden behind front faces.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    if faces.size == 0:
+        return False
+    a = faces.ravel()
+    b = np.roll(faces, -1, axis=1).ravel()
+    keep = a != b
+    stride = int(faces.max()) + 1
+    forward = np.sort(a[keep] * stride + b[keep])
+    backward = np.sort(b[keep] * stride + a[keep])
+    return bool(np.all(forward[1:] != forward[:-1]) and np.array_equal(forward, backward))
+
+
+def signed_volume(vertices, faces):
+    """Volume enclosed by closed padded faces; negative when they are wound inward."""
+    corners = vertices[faces]
+    # fan of triangles from each face's first vertex; padding adds empty ones
+    fans = np.cross(corners[:, 1:-1], corners[:, 2:])
+    return float(np.einsum('ij,ikj->', corners[:, 0], fans)) / 6
+
+
+def reverse_faces(faces):
+    """Padded faces with their winding reversed, padding kept at the end."""
+    counts = 1 + np.count_nonzero(faces[:, 1:] != faces[:, :-1], axis=1)
+    columns = np.maximum(counts[:, None] - 1 - np.arange(faces.shape[1]), 0)
+    return np.take_along_axis(faces, columns, axis=1)
+
+
+def prepare_mesh(shape):
+    """
+    Convert a shape's geometry in place to render-ready arrays: vertices as
+    a contiguous (N, 3) float array, edges as (E, 2) int32 and faces, if
+    any, as padded (F, k) int32, with redundant geometry removed by
+    optimize_mesh (the counts removed are kept as shape.removed). Also
+    precomputes the object-space center, bounding radius, mean edge length,
+    face normals and face centers, which only need rotating each frame.
+    shape.closed tells whether back faces can be culled by winding; closed
+    meshes wound inward are turned outside out first.
+    """
+    shape.removed = optimize_mesh(shape)
+    shape.center = shape.vertices.mean(axis=0)
+    # bounding sphere and mean edge length, used for culling and level of detail
+    shape.radius = float(np.linalg.norm(shape.vertices - shape.center, axis=1).max(initial=0))
+    edge_vectors = shape.vertices[shape.edges[:, 1]] - shape.vertices[shape.edges[:, 0]]
+    shape.mean_edge_length = float(np.linalg.norm(edge_vectors, axis=1).mean()) if len(edge_vectors) else 0.0
+    if hasattr(shape, 'faces'):
+        shape.faces = pad_faces(shape.faces)
+        shape.closed = closed_surface(shape.faces)
+        if shape.closed and signed_volume(shape.vertices, shape.faces) < 0:
+            shape.faces = reverse_faces(shape.faces)
+        shape.face_normals = face_normals(shape.vertices, shape.faces)
+        shape.face_centers = face_centers(shape.vertices, shape.faces)
+    return shape
+
+
+class MeshRegistry:
+    """
+    Builds each (shape name, parameters) mesh once and hands out the same
+    prepared object afterwards. Shapes are shared, so callers must treat
+    their arrays as read-only.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.meshes = {}
+
+    def get(self, name, **params):
+        key = (name, tuple(sorted(params.items())))
+        mesh = self.meshes.get(key)
+        if mesh is None:
+            mesh = prepare_mesh(self.factory(name, **params))
+            self.meshes[key] = mesh
+        return mesh
+
+    def clear(self):
+        self.meshes.clear()
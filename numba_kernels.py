@@ -0,0 +1,103 @@
+from numba import njit
+
+from kernels import NO_ATTRIBUTES, NO_COLORS
+
+# compiled twins of the NumPy kernels in kernels.py, with the same
+# arithmetic so that the pixels come out identical; cache=True keeps the
+# machine code on disk, so only the first run pays for compiling
+
+@njit(cache=True)
+def numba_draw_lines(pixels, attributes, p0, p1, code, attribute):
+    height, width = pixels.shape
+    colored = attributes.shape[0] > 0
+    written = 0
+    for e in range(p0.shape[0]):
+        x0, y0, x1, y1 = p0[e, 0], p0[e, 1], p1[e, 0], p1[e, 1]
+        dx, dy = abs(x1 - x0), abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx - dy
+        while True:
+            if 0 <= x0 < width and 0 <= y0 < height:
+                pixels[y0, x0] = code
+                if colored:
+                    attributes[y0, x0] = attribute
+                written += 1
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                x0 += sx
+            if e2 < dx:
+                err += dx
+                y0 += sy
+    return written
+
+@njit(cache=True)
+def numba_fill_spans(pixels, attributes, ys, x_start, x_end, codes, colors):
+    colored = attributes.shape[0] > 0
+    for i in range(ys.shape[0]):
+        y = ys[i]
+        for x in range(x_start[i], x_end[i] + 1):
+            pixels[y, x] = codes[i]
+            if colored:
+                attributes[y, x] = colors[i]
+
+@njit(cache=True)
+def numba_fill_spans_depth(pixels, depth, attributes, ys, x_start, x_end, planes, codes, colors):
+    colored = attributes.shape[0] > 0
+    for i in range(ys.shape[0]):
+        y = ys[i]
+        a, b, c = planes[i, 0], planes[i, 1], planes[i, 2]
+        offset = b * y + c
+        for x in range(x_start[i], x_end[i] + 1):
+            d = a * x + offset
+            if d <= depth[y, x] + 1e-9 * abs(d):
+                pixels[y, x] = codes[i]
+                depth[y, x] = d
+                if colored:
+                    attributes[y, x] = colors[i]
+
+@njit(cache=True)
+def numba_splat(pixels, depth, attributes, xs, ys, depths, codes, colors):
+    colored = attributes.shape[0] > 0
+    for i in range(xs.shape[0]):
+        if depths[i] < depth[ys[i], xs[i]]:
+            depth[ys[i], xs[i]] = depths[i]
+    written = 0
+    for i in range(xs.shape[0]):
+        if depths[i] <= depth[ys[i], xs[i]]:
+            pixels[ys[i], xs[i]] = codes[i]
+            if colored:
+                attributes[ys[i], xs[i]] = colors[i]
+            written += 1
+    return written
+
+class NumbaKernels:
+    """Raster kernels compiled by Numba; same signatures as NumpyKernels."""
+
+    name = "numba"
+
+    @staticmethod
+    def draw_lines(pixels, attributes, p0, p1, code, attribute):
+        return numba_draw_lines(pixels, NO_ATTRIBUTES if attributes is None else attributes,
+                                p0, p1, code, attribute)
+
+    @staticmethod
+    def fill_spans(pixels, attributes, ys, x_start, x_end, codes, colors):
+        if attributes is None:
+            attributes, colors = NO_ATTRIBUTES, NO_COLORS
+        numba_fill_spans(pixels, attributes, ys, x_start, x_end, codes, colors)
+
+    @staticmethod
+    def fill_spans_depth(pixels, depth, attributes, ys, x_start, x_end, planes, codes, colors):
+        if attributes is None:
+            attributes, colors = NO_ATTRIBUTES, NO_COLORS
+        numba_fill_spans_depth(pixels, depth, attributes, ys, x_start, x_end, planes, codes, colors)
+
+    @staticmethod
+    def splat(pixels, depth, attributes, xs, ys, depths, codes, colors):
+        if attributes is None:
+            attributes, colors = NO_ATTRIBUTES, NO_COLORS
+        return numba_splat(pixels, depth, attributes, xs, ys, depths, codes, colors)
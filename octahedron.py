@@ -16,8 +16,8 @@ class Octahedron:
         ])
 
         # Define the edges connecting the vertices
-        self.edges = [
+        self.edges = np.array([
             (0, 1), (0, 2), (0, 3), (0, 4),  # Top pyramid
             (5, 1), (5, 2), (5, 3), (5, 4),  # Bottom pyramid
             (1, 2), (2, 3), (3, 4), (4, 1)   # Middle square
-        ]
+        ], dtype=np.int32)
@@ -0,0 +1,76 @@
+import time
+from collections import deque
+
+
+class FrameScheduler:
+    """
+    Deadline-based frame pacing on a monotonic clock.
+
+    Frames are laid out on a fixed grid of 1 / fps slots from the start
+    time. When the loop falls behind, presents are dropped and missed slots
+    are skipped, so the animation (driven by elapsed()) keeps its speed
+    instead of slowing down with the render cost.
+    """
+
+    def __init__(self, fps, max_consecutive_drops=2, clock=time.monotonic, sleep=time.sleep):
+        self.frame_duration = 1 / fps
+        self.max_consecutive_drops = max_consecutive_drops
+        self.clock = clock
+        self.sleep = sleep
+        self.start_time = None
+        self.deadline = None
+        self.frames_presented = 0
+        self.frames_dropped = 0
+        self.consecutive_drops = 0
+        # present timestamps over roughly the last second, for achieved fps
+        self.present_times = deque(maxlen=max(int(fps), 2))
+
+    def start(self):
+        self.start_time = self.clock()
+        self.deadline = self.start_time
+
+    def elapsed(self):
+        """Seconds since start(); use this to drive the animation."""
+        return self.clock() - self.start_time
+
+    def should_present(self):
+        """
+        Whether the frame just rendered should be presented. Returns False
+        when the loop is more than a frame behind, but never for more than
+        max_consecutive_drops frames in a row.
+        """
+        behind = self.clock() - self.deadline > self.frame_duration
+        if behind and self.consecutive_drops < self.max_consecutive_drops:
+            return False
+        return True
+
+    def end_frame(self, presented):
+        """Record the outcome of this slot and sleep until the next one."""
+        now = self.clock()
+        if presented:
+            self.frames_presented += 1
+            self.consecutive_drops = 0
+            self.present_times.append(now)
+        else:
+            self.frames_dropped += 1
+            self.consecutive_drops += 1
+
+        self.deadline += self.frame_duration
+        if now > self.deadline:
+            # skip the slots we already missed rather than rushing through them
+            missed = int((now - self.deadline) / self.frame_duration) + 1
+            self.deadline += missed * self.frame_duration
+            self.frames_dropped += missed
+        self.sleep(max(self.deadline - self.clock(), 0))
+
+    @property
+    def achieved_fps(self):
+        """Presented frames per second over the recent window."""
+        if len(self.present_times) < 2:
+            return 0.0
+        span = self.present_times[-1] - self.present_times[0]
+        return (len(self.present_times) - 1) / span if span > 0 else 0.0
+
+    def stats_line(self):
+        return (f"{self.achieved_fps:5.1f} fps  "
+                f"{self.frames_presented} presented  {self.frames_dropped} dropped")
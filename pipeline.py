@@ -0,0 +1,87 @@
+import threading
+from collections import deque
+
+from instrument import NULL_PROFILER
+
+
+class FrameRing:
+    """
+    A small ring of preallocated frame buffers passed between a render
+    thread and a present thread without copying.
+
+    The render thread acquire()s a free buffer, fills it and publish()es it.
+    The present thread take()s published buffers in order and release()s
+    them once written. When every buffer is in use, policy decides what the
+    render thread does: 'block' waits for the present thread, 'drop' reuses
+    the oldest published frame that has not been presented yet.
+    """
+
+    def __init__(self, buffers, policy='block'):
+        if policy not in ('block', 'drop'):
+            raise ValueError(f"Invalid back-pressure policy: {policy}")
+        if len(buffers) < 2:
+            raise ValueError("A frame ring needs at least two buffers.")
+        self.policy = policy
+        self.free = deque(buffers)
+        self.ready = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def acquire(self):
+        """Get a buffer to render into, or None once the ring is closed."""
+        with self.condition:
+            while not self.free and not self.closed:
+                if self.policy == 'drop' and self.ready:
+                    buffer, _ = self.ready.popleft()
+                    self.dropped += 1
+                    return buffer
+                self.condition.wait()
+            if self.closed:
+                return None
+            return self.free.popleft()
+
+    def publish(self, buffer, footer=None):
+        """Hand a rendered buffer to the present thread."""
+        with self.condition:
+            self.ready.append((buffer, footer))
+            self.condition.notify_all()
+
+    def take(self):
+        """Wait for the next rendered buffer; returns (None, None) once closed."""
+        with self.condition:
+            while not self.ready and not self.closed:
+                self.condition.wait()
+            if not self.ready:
+                return None, None
+            return self.ready.popleft()
+
+    def release(self, buffer):
+        """Return a presented buffer to the free list."""
+        with self.condition:
+            self.free.append(buffer)
+            self.condition.notify_all()
+
+    def close(self):
+        """Wake both threads and stop handing out buffers."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+def present_loop(ring, profiler=NULL_PROFILER):
+    """Present thread body: display canvases from the ring until it closes."""
+    while True:
+        canvas, footer = ring.take()
+        if canvas is None:
+            break
+        with profiler.span("present"):
+            canvas.display(footer)
+        profiler.count("bytes_emitted", canvas.presenter.last_frame_bytes)
+        ring.release(canvas)
+
+
+def start_present_thread(ring, profiler=NULL_PROFILER):
+    thread = threading.Thread(target=present_loop, args=(ring, profiler), name="present", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,174 @@
+import sys
+
+import numpy as np
+
+
+def full_frame(frame, attributes=None, palette=None):
+    """
+    Escape sequences that hide the cursor, clear the screen and draw the whole
+    frame, colored by a parallel array of cell attributes if given.
+    """
+    height, width = frame.shape
+    rows = np.empty((height, width + 1), dtype=np.uint8)
+    rows[:, :width] = frame
+    rows[:, width] = ord('\n')
+    if attributes is None:
+        return '\033[?25l\033[H\033[2J' + rows.tobytes()[:-1].decode('latin-1')
+    colors = np.zeros((height, width + 1), dtype=np.uint8)
+    colors[:, :width] = attributes
+    return '\033[?25l\033[H\033[2J' + colorize(rows.ravel()[:-1], colors.ravel()[:-1], palette.sgr)
+
+
+def ink_attributes(codes, attributes):
+    """
+    Attributes of a flat run of cells as they need to be sent: a blank
+    looks the same in any foreground color, so blanks and newlines keep
+    the color of the cell before them instead of switching color.
+    """
+    inked = (codes != ord(' ')) & (codes != ord('\n'))
+    index = np.where(inked, np.arange(len(codes)), 0)
+    np.maximum.accumulate(index, out=index)
+    return np.where(np.logical_or.accumulate(inked), attributes[index], 0)
+
+
+def attribute_changes(attributes):
+    """Positions where a flat attribute sequence differs from the cell before, starting from 0."""
+    changed = np.empty(len(attributes), dtype=bool)
+    changed[0] = attributes[0] != 0
+    np.not_equal(attributes[1:], attributes[:-1], out=changed[1:])
+    return np.flatnonzero(changed)
+
+
+def colorize(codes, attributes, sgr):
+    """
+    Text of a flat array of byte codes with an SGR sequence wherever the
+    color of its characters changes, restoring the default color at the end.
+    """
+    text = codes.tobytes().decode('latin-1')
+    attributes = ink_attributes(codes, attributes)
+    parts = []
+    position = 0
+    for change in attribute_changes(attributes).tolist():
+        parts.append(text[position:change])
+        parts.append(sgr[attributes[change]])
+        position = change
+    parts.append(text[position:])
+    if attributes[-1]:
+        parts.append(sgr[0])
+    return ''.join(parts)
+
+
+class TerminalPresenter:
+    """
+    Writes uint8 frames of byte codes to a terminal, sending only the cells
+    that changed since the previously presented frame.
+    """
+
+    def __init__(self, stream=None, merge_gap=8, palette=None):
+        self.stream = stream if stream is not None else sys.stdout
+        # colors of cell attributes, for frames presented with attributes
+        self.palette = palette
+        # unchanged gaps shorter than this are rewritten rather than skipped,
+        # since a cursor move costs about as many bytes
+        self.merge_gap = merge_gap
+        self.previous = None
+        self.previous_attributes = None
+        self.last_frame_bytes = 0
+        self.total_bytes = 0
+        self.frames = 0
+
+    def reset(self):
+        """Forget the previous frame so the next one is drawn in full."""
+        self.previous = None
+
+    def encode(self, frame, attributes=None):
+        """
+        Return the escape sequences that turn the previous frame into this one.
+        attributes is an optional uint8 array of cell colors (see color.Palette).
+        """
+        # switching between plain and colored frames redraws everything
+        if (attributes is None) != (self.previous_attributes is None):
+            self.previous = None
+        if self.previous is None or self.previous.shape != frame.shape:
+            data = full_frame(frame, attributes, self.palette)
+            self.previous = frame.copy()
+            self.previous_attributes = None if attributes is None else attributes.copy()
+            return data
+
+        height, width = frame.shape
+        changed = np.zeros((height, width + 1), dtype=bool)
+        np.not_equal(frame, self.previous, out=changed[:, :width])
+        if attributes is not None:
+            changed[:, :width] |= attributes != self.previous_attributes
+        if not changed.any():
+            return ''
+
+        # runs of changed cells; the padding column keeps runs within a row
+        edges = np.diff(changed.ravel().view(np.int8), prepend=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        row_length = width + 1
+        merge = ((starts[1:] - ends[:-1] < self.merge_gap)
+                 & (starts[1:] // row_length == ends[:-1] // row_length))
+        starts = starts[np.concatenate(([True], ~merge))]
+        ends = ends[np.concatenate((~merge, [True]))]
+        self.previous[:] = frame
+        if attributes is not None:
+            self.previous_attributes[:] = attributes
+            return self.encode_colored(frame, attributes, starts, ends, row_length)
+
+        parts = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            y, x0 = divmod(start, row_length)
+            x1 = end - y * row_length
+            parts.append(f'\033[{y + 1};{x0 + 1}H')
+            parts.append(frame[y, x0:x1].tobytes().decode('latin-1'))
+        return ''.join(parts)
+
+    def encode_colored(self, frame, attributes, starts, ends, row_length):
+        """
+        Encode runs of cells [start, end) (flat indices into rows of
+        row_length) with their colors. Runs are split where the color of
+        the ink changes and an SGR is written only there; the color carries
+        over cursor moves, and the frame ends on the default color.
+        """
+        lengths = ends - starts
+        offsets = np.cumsum(lengths) - lengths
+        cells = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+        y, x = np.divmod(cells, row_length)
+        codes = frame[y, x]
+        text = codes.tobytes().decode('latin-1')
+        colors = ink_attributes(codes, attributes[y, x])
+        changes = attribute_changes(colors)
+
+        sgr = self.palette.sgr
+        moves = dict(zip(offsets.tolist(), starts.tolist()))
+        bounds = np.union1d(offsets, changes).tolist()
+        changes = set(changes.tolist())
+        parts = []
+        for begin, end in zip(bounds, bounds[1:] + [len(text)]):
+            start = moves.get(begin)
+            if start is not None:
+                row, column = divmod(start, row_length)
+                parts.append(f'\033[{row + 1};{column + 1}H')
+            if begin in changes:
+                parts.append(sgr[colors[begin]])
+            parts.append(text[begin:end])
+        if colors[-1]:
+            parts.append(sgr[0])
+        return ''.join(parts)
+
+    def present(self, frame, footer=None, attributes=None):
+        """
+        Write one frame in a single buffered write. An optional footer line
+        (e.g. live stats) is written below the frame in the same write.
+        """
+        data = self.encode(frame, attributes)
+        if footer is not None:
+            data += f'\033[{frame.shape[0] + 1};1H{footer}\033[K'
+        if data:
+            self.stream.write(data)
+            self.stream.flush()
+        self.last_frame_bytes = len(data.encode())
+        self.total_bytes += self.last_frame_bytes
+        self.frames += 1
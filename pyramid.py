@@ -16,7 +16,7 @@ class Pyramid:
         ])
 
         # Define the edges connecting the vertices
-        self.edges = [
+        self.edges = np.array([
             (0, 1), (1, 2), (2, 3), (3, 0),  # Base square
             (0, 4), (1, 4), (2, 4), (3, 4)   # Sides
-        ]
+        ], dtype=np.int32)
@@ -0,0 +1,754 @@
+import importlib
+import math
+import time
+
+import numpy as np
+
+from instrument import NULL_PROFILER
+from kernels import get_kernels
+from lighting import PointLight, DirectionalLight, face_brightness
+from mesh import MeshRegistry, prepare_mesh
+from present import TerminalPresenter
+from scene import instance_models, transform_instances, visible_spheres
+from surface import facing_viewer, splat, supports_surface, surface_samples
+from transform import (frame_matrix, rotate_vertices, project_vertices, vertex_depths, front_facing,
+                       screen_radius)
+
+def glyph_codes(chars):
+    """Byte codes for a character, a sequence of characters or a code array."""
+    if isinstance(chars, str):
+        return np.frombuffer(chars.encode('latin-1'), dtype=np.uint8)
+    chars = np.asarray(chars)
+    if chars.dtype == np.uint8:
+        return chars
+    if chars.dtype.kind == 'U':
+        return chars.astype('S1').view(np.uint8).reshape(chars.shape)
+    return np.frombuffer(''.join(chars).encode('latin-1'), dtype=np.uint8)
+
+
+class CharView:
+    """
+    Character view over a uint8 pixel array, so that code written against
+    the old '<U1' canvas (canvas.canvas[y, x] = char) keeps working.
+    """
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+
+    @property
+    def shape(self):
+        return self.pixels.shape
+
+    def __len__(self):
+        return len(self.pixels)
+
+    def __getitem__(self, key):
+        codes = self.pixels[key]
+        if np.ndim(codes) == 0:
+            return chr(codes)
+        return np.ascontiguousarray(codes).view('S1').astype('<U1')
+
+    def __setitem__(self, key, value):
+        codes = glyph_codes(value)
+        self.pixels[key] = codes[0] if isinstance(value, str) else codes
+
+    def __array__(self, dtype=None, copy=None):
+        chars = self[...]
+        return chars if dtype is None else chars.astype(dtype)
+
+
+class ASCIICanvas3D:
+    def __init__(self, width, height, background=' ', depth_buffer=False, palette=None, backend=None,
+                 zoom=None):
+        self.width = width
+        self.height = height
+        # projection scale relative to the 80x40 layout the shapes are sized
+        # for; by default the shapes are scaled to fit the canvas
+        self.zoom = zoom if zoom is not None else zoom_to_fit(width, height)
+        self.background = background
+        # one byte per cell; a trailing newline column makes the whole
+        # buffer serialize to the frame text in a single copy
+        self.buffer = np.empty((height, width + 1), dtype=np.uint8)
+        self.buffer[:, width] = ord('\n')
+        self.pixels = self.buffer[:, :width]
+        self.pixels[:] = ord(background)
+        # optional per-pixel depth; smaller values are nearer the viewer
+        self.depth = np.full((height, width), np.inf) if depth_buffer else None
+        # optional color per cell, as attributes of a color.Palette (0 = default)
+        self.palette = palette
+        self.attributes = np.zeros((height, width), dtype=np.uint8) if palette is not None else None
+        self.presenter = TerminalPresenter(palette=palette)
+        # raster kernel backend (see kernels), loaded on first use
+        self.backend = backend
+        # cells rasterized since the last clear(), including overdraw
+        self.pixels_written = 0
+
+    @property
+    def kernels(self):
+        """Raster kernels: compiled with Numba when installed, else NumPy."""
+        return get_kernels(self.backend)
+
+    @property
+    def canvas(self):
+        """Character view of the pixels, kept for existing callers."""
+        return CharView(self.pixels)
+
+    def clear(self):
+        self.pixels[:] = ord(self.background)
+        self.pixels_written = 0
+        if self.depth is not None:
+            self.depth.fill(np.inf)
+        if self.attributes is not None:
+            self.attributes.fill(0)
+
+    def to_string(self):
+        """The frame as text, rows separated by newlines."""
+        return self.buffer.tobytes()[:-1].decode('latin-1')
+
+    def display(self, footer=None):
+        self.presenter.present(self.pixels, footer, self.attributes)
+
+    def draw_line(self, x0, y0, x1, y1, char='#'):
+        """Draw a line from (x0, y0) to (x1, y1) using Bresenham's algorithm."""
+        x0 = int(round(x0))
+        y0 = int(round(y0))
+        x1 = int(round(x1))
+        y1 = int(round(y1))
+        dx = abs(x1 - x0)
+        dy = abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx - dy
+        
+        while True:
+            if 0 <= x0 < self.width and 0 <= y0 < self.height:
+                self.pixels[y0, x0] = ord(char)
+                self.pixels_written += 1
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                x0 += sx
+            if e2 < dx:
+                err += dx
+                y0 += sy
+
+    def draw_lines(self, p0, p1, char='#', attribute=0):
+        """
+        Draw many lines at once; p0 and p1 are (E, 2) arrays of endpoints.
+        Produces the same pixels as calling draw_line for every edge.
+        On a color canvas the lines get the given cell attribute.
+        """
+        p0 = np.rint(np.asarray(p0, dtype=float)).astype(np.int64).reshape(-1, 2)
+        p1 = np.rint(np.asarray(p1, dtype=float)).astype(np.int64).reshape(-1, 2)
+        if len(p0) == 0:
+            return
+        self.pixels_written += self.kernels.draw_lines(self.pixels, self.attributes, p0, p1, ord(char),
+                                                       attribute)
+
+
+
+def project_vertex(vertex, screen_width, screen_height, scale=4, offset=(20,-20)):
+    """
+    Project a 3D vertex onto 2D screen coordinates using orthographic projection.
+    """
+    x, y, z = vertex
+    # orthographic projection: ignore z-coordinate
+    x_proj = x * scale + offset[0]
+    y_proj = y * scale + offset[1]
+    # invert y-axis for correct display
+    y_proj = -y_proj
+    return (x_proj, y_proj)
+
+def perspective_projection(vertex, screen_width, screen_height, fov=200, viewer_distance=45):
+    """
+    Project a 3D vertex onto 2D screen coordinates using perspective projection.
+    """
+    x, y, z = vertex
+    factor = fov / (viewer_distance + z)
+    x_proj = x * factor + screen_width / 2
+    y_proj = -y * factor + screen_height / 2
+    return (x_proj, y_proj)
+
+
+def rotate_vertex(vertex, angle_x, angle_y, angle_z):
+    x, y, z = vertex
+    # rotation around X-axis
+    cos_x, sin_x = math.cos(angle_x), math.sin(angle_x)
+    y, z = y * cos_x - z * sin_x, y * sin_x + z * cos_x
+    # rotation around Y-axis
+    cos_y, sin_y = math.cos(angle_y), math.sin(angle_y)
+    x, z = x * cos_y + z * sin_y, -x * sin_y + z * cos_y
+    # rotation around Z-axis
+    cos_z, sin_z = math.cos(angle_z), math.sin(angle_z)
+    x, y = x * cos_z - y * sin_z, x * sin_z + y * cos_z
+    return (x, y, z)
+
+def draw_face(canvas, points, char):
+    num_points = len(points)
+    for i in range(num_points):
+        x0, y0 = points[i]
+        x1, y1 = points[(i + 1) % num_points]
+        canvas.draw_line(x0, y0, x1, y1, char=char)
+
+def fill_polygon(canvas, vertices, char):
+    """
+    Fill a polygon on the canvas given its vertices and fill character.
+    Uses the Scanline Fill Algorithm.
+    """
+    # extract x and y coordinates from vertices
+    x_coords = [int(round(x)) for x, y in vertices]
+    y_coords = [int(round(y)) for x, y in vertices]
+    num_vertices = len(vertices)
+
+    # find the bounding box of the polygon
+    min_y = max(min(y_coords), 0)
+    max_y = min(max(y_coords), canvas.height - 1)
+
+    # create an edge table
+    edge_table = []
+    for i in range(num_vertices):
+        x0, y0 = x_coords[i], y_coords[i]
+        x1, y1 = x_coords[(i + 1) % num_vertices], y_coords[(i + 1) % num_vertices]
+
+        if y0 == y1:
+            continue  # Ignore horizontal edges
+
+        if y0 > y1:
+            x0, y0, x1, y1 = x1, y1, x0, y0  # swap to ensure y0 <= y1
+
+        inverse_slope = (x1 - x0) / (y1 - y0)
+        edge_table.append({
+            'y_min': y0,
+            'y_max': y1,
+            'x_at_y_min': x0,
+            'inverse_slope': inverse_slope
+        })
+
+    # sort the edge table by y_min
+    edge_table.sort(key=lambda e: e['y_min'])
+
+    # scanline fill
+    y = min_y
+    active_edges = []
+    while y <= max_y:
+        # add edges where y == y_min to active edges
+        for edge in edge_table:
+            if edge['y_min'] == y:
+                active_edges.append(edge)
+
+        # remove edges where y == y_max from active edges
+        active_edges = [e for e in active_edges if e['y_max'] != y]
+
+        # sort active edges by x_at_y_min
+        active_edges.sort(key=lambda e: e['x_at_y_min'])
+
+       # fill between pairs of intersections
+        i = 0
+        while i < len(active_edges) - 1:
+            x_start = active_edges[i]['x_at_y_min']
+            x_end = active_edges[i + 1]['x_at_y_min']
+
+            x_start = int(round(x_start))
+            x_end = int(round(x_end))
+
+            # Clip to canvas bounds
+            x_start = max(x_start, 0)
+            x_end = min(x_end, canvas.width - 1)
+
+            for x in range(x_start, x_end + 1):
+                if 0 <= x < canvas.width and 0 <= y < canvas.height:
+                    canvas.canvas[y, x] = char
+            i += 2  # move to the next pair
+
+        # increment x_at_y_min for each active edge
+        for edge in active_edges:
+            edge['x_at_y_min'] += edge['inverse_slope']
+
+        y += 1
+
+def fill_polygons(canvas, polygons, chars, depths=None, attributes=None):
+    """
+    Fill many polygons in one batch.
+    polygons is an (F, k, 2) array of screen vertices and chars holds one fill
+    character per polygon (or a single character for all of them). Follows
+    the same edge rules as fill_polygon, so the output is pixel-identical to
+    filling the polygons one after another in order.
+    If the canvas has a depth buffer and depths gives an (F, k) depth per
+    vertex, each pixel is only written when it is nearer than what is there.
+    On a color canvas, attributes gives one cell attribute per polygon.
+    """
+    polygons = np.asarray(polygons, dtype=float)
+    num_faces, num_vertices = polygons.shape[:2]
+    if num_faces == 0:
+        return
+    codes = glyph_codes(chars)
+    if len(codes) == 1:
+        codes = np.repeat(codes, num_faces)
+
+    x_coords = np.rint(polygons[:, :, 0]).astype(np.int64)
+    y_coords = np.rint(polygons[:, :, 1]).astype(np.int64)
+    max_y = np.minimum(y_coords.max(axis=1), canvas.height - 1)
+
+    # edge table: one row per polygon edge, oriented so that y0 <= y1
+    x0, y0 = x_coords, y_coords
+    x1, y1 = np.roll(x_coords, -1, axis=1), np.roll(y_coords, -1, axis=1)
+    swap = y0 > y1
+    x0, x1 = np.where(swap, x1, x0).ravel(), np.where(swap, x0, x1).ravel()
+    y0, y1 = np.where(swap, y1, y0).ravel(), np.where(swap, y0, y1).ravel()
+    face = np.repeat(np.arange(num_faces), num_vertices)
+
+    # skip horizontal edges and edges that start outside the scanned rows
+    keep = (y0 != y1) & (y0 >= 0) & (y0 <= max_y[face])
+    x0, y0, x1, y1, face = x0[keep], y0[keep], x1[keep], y1[keep], face[keep]
+    if len(face) == 0:
+        return
+    inverse_slope = (x1 - x0) / (y1 - y0)
+
+    # an edge is active from y_min up to (not including) y_max
+    active_rows = np.minimum(y1 - 1, max_y[face]) - y0 + 1
+
+    # step all edges down together; accumulating the slope keeps the
+    # floating-point x positions identical to the scalar filler
+    x = x0.astype(float)
+    hit_x, hit_y, hit_face = [], [], []
+    for row in range(active_rows.max()):
+        live = active_rows > row
+        hit_x.append(x[live])
+        hit_y.append(y0[live] + row)
+        hit_face.append(face[live])
+        x += inverse_slope
+    hit_x = np.concatenate(hit_x)
+    hit_y = np.concatenate(hit_y)
+    hit_face = np.concatenate(hit_face)
+
+    # sort intersections by polygon, scanline and x, then pair them up
+    order = np.lexsort((hit_x, hit_y, hit_face))
+    hit_x, hit_y, hit_face = hit_x[order], hit_y[order], hit_face[order]
+    group_start = np.ones(len(order), dtype=bool)
+    group_start[1:] = (hit_face[1:] != hit_face[:-1]) | (hit_y[1:] != hit_y[:-1])
+    start_index = np.maximum.accumulate(np.where(group_start, np.arange(len(order)), 0))
+    rank = np.arange(len(order)) - start_index
+    first = np.flatnonzero((rank % 2 == 0)[:-1] & ~group_start[1:])
+
+    x_start = np.maximum(np.rint(hit_x[first]).astype(np.int64), 0)
+    x_end = np.minimum(np.rint(hit_x[first + 1]).astype(np.int64), canvas.width - 1)
+    canvas.pixels_written += int(np.maximum(x_end - x_start + 1, 0).sum())
+
+    # one span per pair; the kernels walk them in order
+    span_face = hit_face[first]
+    colored = canvas.attributes is not None and attributes is not None
+    target = canvas.attributes if colored else None
+    colors = np.asarray(attributes, dtype=np.uint8)[span_face] if colored else None
+    if canvas.depth is None or depths is None:
+        canvas.kernels.fill_spans(canvas.pixels, target, hit_y[first], x_start, x_end, codes[span_face],
+                                  colors)
+        return
+
+    plane = depth_planes(polygons, np.asarray(depths, dtype=float))
+    canvas.kernels.fill_spans_depth(canvas.pixels, canvas.depth, target, hit_y[first], x_start, x_end,
+                                    plane[span_face], codes[span_face], colors)
+
+def depth_planes(polygons, depths):
+    """
+    Fit depth = a * x + b * y + c through the first three vertices of each
+    polygon. Polygons seen edge-on get a constant depth.
+    """
+    x, y = polygons[:, :3, 0], polygons[:, :3, 1]
+    d = depths[:, :3]
+    ux, uy, ud = x[:, 1] - x[:, 0], y[:, 1] - y[:, 0], d[:, 1] - d[:, 0]
+    vx, vy, vd = x[:, 2] - x[:, 0], y[:, 2] - y[:, 0], d[:, 2] - d[:, 0]
+    det = ux * vy - vx * uy
+    flat = np.abs(det) < 1e-9
+    safe = np.where(flat, 1.0, det)
+    a = np.where(flat, 0.0, (ud * vy - vd * uy) / safe)
+    b = np.where(flat, 0.0, (ux * vd - vx * ud) / safe)
+    c = np.where(flat, depths.mean(axis=1), d[:, 0] - a * x[:, 0] - b * y[:, 0])
+    return np.stack([a, b, c], axis=1)
+
+# shapes cycled through in screensaver mode
+AVAILABLE_SHAPES = ["cube", "pyramid", "tetrahedron", "octahedron", "sphere", "donut"]
+
+###### Light position ######
+LIGHT_POSITION = np.array([0, 20, -30])
+AMBIENT = 0.2  # ambient light level (0 to 1)
+POINT_LIGHT = PointLight(LIGHT_POSITION)
+# a light infinitely far away in the direction of LIGHT_POSITION
+DIRECTIONAL_LIGHT = DirectionalLight(LIGHT_POSITION)
+
+# ASCII characters representing different brightness levels
+ASCII_CHARS = [' ', '.', ':', '-', '=', '+', '*', '#', '%', '@']
+# lookup table from brightness index to canvas byte code
+GLYPHS = glyph_codes(ASCII_CHARS)
+
+# rotation speed per axis in radians per second (0.02 per frame at 30 fps)
+ROTATION_SPEED = 0.6
+
+# stages timed by render_frame
+STAGES = ("transform", "raster", "shade", "fill", "present")
+# rendering modes; solid needs faces and surface a parametric surface
+MODES = ("wireframe", "solid", "surface")
+
+# shape name: module, class, constructor arguments and the arguments set
+# by segments; modules are imported when a shape is first built
+SHAPE_TYPES = {
+    "cube": ("cube", "Cube", {"center": (0, 0, 0), "size": 5}, ()),
+    "donut": ("donut", "Donut", {"R": 3, "r": 1, "segments": 30}, ("segments",)),
+    "figure8": ("figure8", "Figure8", {"center": (0, 0, 0), "size": 8, "segments": 16}, ("segments",)),
+    "pyramid": ("pyramid", "Pyramid", {"center": (0, 0, 0), "size": 5}, ()),
+    "sphere": ("sphere", "Sphere", {"center": (0, 0, 0), "radius": 4, "segments": 9, "rings": 9},
+               ("segments", "rings")),
+    "tetrahedron": ("tetrahedron", "Tetrahedron", {"center": (0, 0, 0), "size": 6}, ()),
+    "octahedron": ("octahedron", "Octahedron", {"center": (0, 0, 0), "size": 8}, ()),
+}
+
+def instantiate_shape(shape_name, segments=None):
+    """
+    Build a shape by name, importing its module on first use. segments
+    overrides the mesh resolution of the curved shapes (Donut, Figure8,
+    Sphere).
+    """
+    if shape_name not in SHAPE_TYPES:
+        raise ValueError(f"Invalid shape: {shape_name}")
+    module, class_name, params, resolution = SHAPE_TYPES[shape_name]
+    params = dict(params)
+    if segments:
+        params.update(dict.fromkeys(resolution, segments))
+    return getattr(importlib.import_module(module), class_name)(**params)
+
+# built meshes, reused across screensaver cycles
+SHAPES = MeshRegistry(instantiate_shape)
+
+def supports_mode(shape, mode):
+    """Whether shape can be rendered in mode."""
+    if mode == 'solid':
+        return hasattr(shape, 'faces')
+    if mode == 'surface':
+        return supports_surface(shape)
+    return True
+
+def get_glyph_index(brightness, levels=len(ASCII_CHARS)):
+    """Indices into a glyph table of levels entries for an array of brightness values in [0, 1]."""
+    return (brightness * (levels - 1)).astype(int)
+
+class FrameBuffers:
+    """
+    Scratch arrays for rendering one mesh: rotated and projected vertices,
+    edge endpoints, vertex depths and rotated face normals and centers.
+    render_frame writes into them in place, so a caller that keeps them
+    across frames (Renderer) avoids reallocating them every frame.
+    """
+
+    def __init__(self, shape, solid=False):
+        if not hasattr(shape, 'radius'):
+            prepare_mesh(shape)
+        count = len(shape.vertices)
+        self.rotated = np.empty((count, 3))
+        self.projected = np.empty((count, 2))
+        self.edge_from = np.ascontiguousarray(shape.edges[:, 0], dtype=np.intp)
+        self.edge_to = np.ascontiguousarray(shape.edges[:, 1], dtype=np.intp)
+        self.starts = np.empty((len(shape.edges), 2))
+        self.ends = np.empty((len(shape.edges), 2))
+        self.solid = solid and hasattr(shape, 'faces')
+        if self.solid:
+            self.depths = np.empty(count)
+            self.normals = np.empty((len(shape.faces), 3))
+            self.centers = np.empty((len(shape.faces), 3))
+        else:
+            self.depths = self.normals = self.centers = None
+
+def line_attribute(canvas):
+    """Cell attribute of wireframe lines: the palette's brightest color, if any."""
+    return canvas.palette.attributes(1.0) if canvas.palette is not None else 0
+
+def visible_faces(shape, normals, centers, center, projection):
+    """
+    Mask of the faces of shape that may be visible, given rotated normals,
+    face centers and shape center. Closed meshes (shape.closed) cull back
+    faces by winding; shapes marked convex (shape.convex) by the direction
+    from their center; open meshes keep every face.
+    """
+    if getattr(shape, 'convex', False):
+        return front_facing(normals, centers, projection, convex_center=center)
+    if getattr(shape, 'closed', False):
+        return front_facing(normals, centers, projection)
+    return np.ones(len(normals), dtype=bool)
+
+def shade_faces(shape, matrix, projection, light=None, buffers=None, palette=None, glyphs=GLYPHS):
+    """
+    Light and cull all faces of a shape in one vectorized pass, using the
+    object-space normals and centers precomputed for the mesh.
+    Returns the indices of the visible faces, their codes from the glyphs
+    table (darkest first) and, given
+    a palette, their color attributes (otherwise None).
+    Rotated normals and centers go into buffers (FrameBuffers) if given.
+    """
+    if not hasattr(shape, 'face_normals'):
+        prepare_mesh(shape)
+    normals = np.matmul(shape.face_normals, matrix.T, out=None if buffers is None else buffers.normals)
+    centers = np.matmul(shape.face_centers, matrix.T, out=None if buffers is None else buffers.centers)
+
+    brightness = face_brightness(normals, centers, light or POINT_LIGHT, AMBIENT)
+
+    # cull faces pointing away from the viewer before filling
+    visible = visible_faces(shape, normals, centers, shape.center @ matrix.T, projection)
+    brightness = brightness[visible]
+    colors = palette.attributes(brightness) if palette is not None else None
+    return shape.faces[visible], glyphs[get_glyph_index(brightness, len(glyphs))], colors
+
+def render_frame(canvas, shape, angles, mode='wireframe', projection='p', timings=None, light=None,
+                 profiler=NULL_PROFILER, buffers=None, glyphs=GLYPHS):
+    """
+    Render one frame of shape at the given rotation angles into canvas.
+    light defaults to POINT_LIGHT. If timings is a dict, the seconds spent
+    in each of STAGES are added to it. Stages and counters are also
+    reported to profiler when it is enabled. buffers are FrameBuffers for
+    shape to reuse; without them, scratch arrays are allocated for this call.
+    """
+    clock = time.perf_counter
+    start = clock()
+    canvas.clear()
+    if buffers is None:
+        buffers = FrameBuffers(shape, mode == 'solid')
+
+    matrix = frame_matrix(*angles)
+    stamps = {}
+    if mode == 'surface':
+        render_surface(canvas, shape, matrix, projection, light, stamps, clock, glyphs)
+    else:
+        # rotate and project all vertices in one batch
+        rotated_vertices = rotate_vertices(shape.vertices, matrix, out=buffers.rotated)
+        projected_vertices = project_vertices(rotated_vertices, canvas.width, canvas.height, projection,
+                                              zoom=canvas.zoom, out=buffers.projected)
+        stamps["transform"] = clock()
+
+        if mode == 'wireframe':
+            # draw all edges in one batch
+            canvas.draw_lines(np.take(projected_vertices, buffers.edge_from, axis=0, out=buffers.starts),
+                              np.take(projected_vertices, buffers.edge_to, axis=0, out=buffers.ends),
+                              char='#', attribute=line_attribute(canvas))
+            stamps["raster"] = clock()
+        elif mode == 'solid':
+            # shade faces, then fill the visible ones in one batch
+            faces, face_codes, face_colors = shade_faces(shape, matrix, projection, light, buffers,
+                                                         canvas.palette, glyphs)
+            stamps["shade"] = clock()
+            depths = vertex_depths(rotated_vertices, projection, out=buffers.depths)
+            fill_polygons(canvas, projected_vertices[faces], face_codes, depths[faces], face_colors)
+            stamps["fill"] = clock()
+            if profiler.enabled:
+                profiler.count("faces_culled", len(shape.faces) - len(faces))
+
+    if profiler.enabled:
+        profiler.count("pixels_written", canvas.pixels_written)
+        stage_start = start
+        for stage, stamp in stamps.items():
+            profiler.add(stage, stage_start, stamp)
+            stage_start = stamp
+
+    if timings is not None:
+        for stage, stamp in stamps.items():
+            timings[stage] = timings.get(stage, 0.0) + stamp - start
+            start = stamp
+
+def render_surface(canvas, shape, matrix, projection, light, stamps, clock, glyphs=GLYPHS):
+    """
+    Surface mode of render_frame: sample the shape's analytic surface at a
+    density that follows its size on screen, then cull, rotate, project,
+    light and depth-test all samples in one batch each. Adds the transform,
+    shade and fill stage times to stamps.
+    """
+    center = matrix @ shape.center
+    cells_per_unit = (screen_radius(center, shape.radius, projection, zoom=canvas.zoom)
+                      / max(shape.radius, 1e-9))
+    points, normals, planes = surface_samples(shape, cells_per_unit)
+    # cull the back half before rotating anything
+    front = facing_viewer(normals, planes, matrix, projection)
+    points = rotate_vertices(points[front], matrix)
+    normals = rotate_vertices(normals[front], matrix)
+    cells = np.rint(project_vertices(points, canvas.width, canvas.height, projection,
+                                     zoom=canvas.zoom)).astype(np.int64)
+    stamps["transform"] = clock()
+
+    brightness = face_brightness(normals, points, light or POINT_LIGHT, AMBIENT)
+    codes = glyphs[get_glyph_index(brightness, len(glyphs))]
+    colors = canvas.palette.attributes(brightness) if canvas.palette is not None else None
+    stamps["shade"] = clock()
+
+    splat(canvas, cells, vertex_depths(points, projection), codes, colors)
+    stamps["fill"] = clock()
+
+def render_scene(canvas, scene, angles, mode='wireframe', projection='p', timings=None, light=None,
+                 profiler=NULL_PROFILER, glyphs=GLYPHS):
+    """
+    Render every instance of a Scene, each spinning by angles in place.
+    Instances of one mesh are culled, transformed and shaded in one batch.
+    Returns the number of instances drawn after frustum culling.
+    """
+    clock = time.perf_counter
+    spent = {}
+    last = clock()
+
+    def lap(stage):
+        nonlocal last
+        now = clock()
+        spent[stage] = spent.get(stage, 0.0) + now - last
+        profiler.add(stage, last, now)
+        last = now
+
+    canvas.clear()
+    frame = frame_matrix(*angles)
+    drawn = 0
+    starts, ends = [], []
+    for mesh, rotations, scales, positions in scene.batches():
+        if mode == 'surface' or not supports_mode(mesh, mode):
+            continue
+        # cull whole instances by their bounding spheres
+        models = instance_models(rotations, scales, frame)
+        centers = models @ mesh.center + positions
+        keep = visible_spheres(centers, mesh.radius * scales, canvas.width, canvas.height, projection,
+                               zoom=canvas.zoom)
+        if not keep.any():
+            lap("transform")
+            continue
+        models, positions, centers = models[keep], positions[keep], centers[keep]
+        count, size = len(models), len(mesh.vertices)
+        drawn += count
+
+        vertices = transform_instances(mesh.vertices, models, positions).reshape(-1, 3)
+        projected = project_vertices(vertices, canvas.width, canvas.height, projection, zoom=canvas.zoom)
+        # topology of every instance, offset into the stacked vertex array
+        offsets = np.arange(count) * size
+        lap("transform")
+
+        if mode == 'wireframe':
+            edges = (mesh.edges[None] + offsets[:, None, None]).reshape(-1, 2)
+            starts.append(projected[edges[:, 0]])
+            ends.append(projected[edges[:, 1]])
+        elif mode == 'solid':
+            # rotation and uniform scale keep normals perpendicular; undo the scale
+            normals = transform_instances(mesh.face_normals, models, np.zeros_like(positions))
+            normals = (normals / scales[keep][:, None, None]).reshape(-1, 3)
+            face_centers = transform_instances(mesh.face_centers, models, positions).reshape(-1, 3)
+            brightness = face_brightness(normals, face_centers, light or POINT_LIGHT, AMBIENT)
+            visible = visible_faces(mesh, normals, face_centers,
+                                    np.repeat(centers, len(mesh.faces), axis=0), projection)
+            faces = (mesh.faces[None] + offsets[:, None, None]).reshape(-1, mesh.faces.shape[1])[visible]
+            profiler.count("faces_culled", len(visible) - len(faces))
+            lap("shade")
+            depths = vertex_depths(vertices, projection)
+            brightness = brightness[visible]
+            colors = canvas.palette.attributes(brightness) if canvas.palette is not None else None
+            fill_polygons(canvas, projected[faces], glyphs[get_glyph_index(brightness, len(glyphs))],
+                          depths[faces], colors)
+            lap("fill")
+
+    if starts:
+        # one line-drawing batch for the whole scene
+        canvas.draw_lines(np.concatenate(starts), np.concatenate(ends), char='#',
+                          attribute=line_attribute(canvas))
+        lap("raster")
+
+    profiler.count("instances_culled", len(scene) - drawn)
+    profiler.count("pixels_written", canvas.pixels_written)
+    if timings is not None:
+        for stage, seconds in spent.items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    return drawn
+
+def zoom_to_fit(width, height):
+    """Projection zoom that fits shapes sized for 80x40 into a width x height canvas."""
+    return min(width / 80, height / 40)
+
+class Renderer:
+    """
+    Embeddable renderer: owns a preallocated canvas, the glyph table and
+    per-mesh scratch buffers, and renders a shape as it looks t seconds
+    into its rotation.
+
+        renderer = Renderer(80, 40, mode='solid')
+        text = renderer.render(SHAPES.get('cube'), 1.5)
+
+    After the first frame of a mesh, vertex, edge and face arrays are
+    transformed in place. The rasterizers still allocate temporaries every
+    frame (span lists and sort keys in fill_polygons, pixel indices in
+    draw_lines), tens of KB at 80x40, all freed within the frame.
+    """
+
+    def __init__(self, width=80, height=40, mode='wireframe', projection='p', light=None,
+                 speed=ROTATION_SPEED, background=' ', palette=None, backend=None, zoom=None,
+                 glyphs=ASCII_CHARS):
+        self.mode = mode
+        self.projection = projection
+        self.light = light or POINT_LIGHT
+        self.speed = speed
+        # shading ramp, darkest first, used for faces and surface samples
+        self.glyphs = glyph_codes(glyphs)
+        # color.Palette for 256-color or truecolor output, None for plain text
+        self.palette = palette
+        # raster kernel backend (see kernels.py), None for the fastest installed
+        self.backend = backend
+        # projection scale; zoom_to_fit(width, height) unless given
+        self.zoom = zoom if zoom is not None else zoom_to_fit(width, height)
+        self.canvas = self.new_canvas(width, height, background)
+        # scratch buffers per mesh, kept with the mesh so ids are not reused
+        self.buffers = {}
+
+    def new_canvas(self, width=None, height=None, background=' '):
+        """A canvas matching this renderer's size and mode, e.g. for a frame ring."""
+        return ASCIICanvas3D(width or self.canvas.width, height or self.canvas.height,
+                             background=background, depth_buffer=self.mode in ('solid', 'surface'),
+                             palette=self.palette, backend=self.backend, zoom=self.zoom)
+
+    def resize(self, width, height, zoom=None):
+        """
+        Resize the renderer's canvas, e.g. after the terminal was resized,
+        and set its zoom (by default zoom_to_fit of the new size). Buffers
+        are reallocated only when the size changes; the presenter is kept
+        and sends a full frame next. Returns whether the size changed.
+        """
+        self.zoom = self.canvas.zoom = zoom if zoom is not None else zoom_to_fit(width, height)
+        canvas = self.canvas
+        if (width, height) == (canvas.width, canvas.height):
+            return False
+        self.canvas = self.new_canvas(width, height, canvas.background)
+        self.canvas.presenter = canvas.presenter
+        return True
+
+    def angles(self, t):
+        """Rotation angles after t seconds."""
+        angle = self.speed * t
+        return (angle, angle, angle)
+
+    def frame_buffers(self, shape):
+        entry = self.buffers.get(id(shape))
+        if entry is None:
+            entry = self.buffers[id(shape)] = (shape, FrameBuffers(shape, self.mode == 'solid'))
+        return entry[1]
+
+    def draw(self, shape, t, canvas=None, timings=None, profiler=NULL_PROFILER):
+        """Render shape at time t into canvas (default: the renderer's own) and return it."""
+        return self.draw_angles(shape, self.angles(t), canvas, timings, profiler)
+
+    def draw_angles(self, shape, angles, canvas=None, timings=None, profiler=NULL_PROFILER):
+        """Render shape at explicit rotation angles into canvas and return it."""
+        canvas = canvas or self.canvas
+        render_frame(canvas, shape, angles, self.mode, self.projection, timings, self.light,
+                     profiler, self.frame_buffers(shape), self.glyphs)
+        return canvas
+
+    def draw_scene(self, scene, t, canvas=None, timings=None, profiler=NULL_PROFILER):
+        """Render every instance of scene at time t into canvas and return it."""
+        canvas = canvas or self.canvas
+        render_scene(canvas, scene, self.angles(t), self.mode, self.projection, timings, self.light,
+                     profiler, self.glyphs)
+        return canvas
+
+    def render(self, shape, t):
+        """Render shape at time t and return the frame as text."""
+        return self.draw(shape, t).to_string()
+
+    def present(self, footer=None):
+        """Write the renderer's canvas to the terminal as a diff against the last frame."""
+        self.canvas.display(footer)
@@ -0,0 +1,103 @@
+import numpy as np
+
+from mesh import prepare_mesh
+from transform import frame_matrix, project_vertices
+
+
+class Instance:
+    """One placement of a shared mesh: position, orientation and uniform scale."""
+
+    def __init__(self, mesh, position=(0, 0, 0), rotation=(0, 0, 0), scale=1.0):
+        self.mesh = mesh
+        self.position = np.asarray(position, dtype=float)
+        self.rotation = frame_matrix(*rotation)
+        self.scale = float(scale)
+
+
+class Scene:
+    """
+    Many instances of the existing shapes. Instances of the same mesh share
+    its vertex and topology arrays and are transformed together.
+    """
+
+    def __init__(self):
+        self.instances = []
+        self._batches = None
+
+    def add(self, mesh, position=(0, 0, 0), rotation=(0, 0, 0), scale=1.0):
+        if not hasattr(mesh, 'radius'):
+            prepare_mesh(mesh)
+        instance = Instance(mesh, position, rotation, scale)
+        self.instances.append(instance)
+        self._batches = None
+        return instance
+
+    def __len__(self):
+        return len(self.instances)
+
+    def batches(self):
+        """
+        Instances grouped by mesh, as (mesh, rotations (I, 3, 3), scales (I,),
+        positions (I, 3)), stacked once and reused until the scene changes.
+        """
+        if self._batches is None:
+            groups = {}
+            for instance in self.instances:
+                groups.setdefault(id(instance.mesh), []).append(instance)
+            self._batches = [
+                (group[0].mesh,
+                 np.stack([i.rotation for i in group]),
+                 np.array([i.scale for i in group]),
+                 np.stack([i.position for i in group]))
+                for group in groups.values()
+            ]
+        return self._batches
+
+
+def scatter(meshes, count, seed=0, extent=(80, 40), depth=(10, 250)):
+    """
+    A scene of count instances of meshes (used in turn) at random positions,
+    orientations and scales. Positions fill a box in front of the viewer that
+    is wider than the view, so part of the scene is always culled.
+    """
+    rng = np.random.default_rng(seed)
+    scene = Scene()
+    for i in range(count):
+        position = (rng.uniform(-extent[0], extent[0]),
+                    rng.uniform(-extent[1], extent[1]),
+                    rng.uniform(*depth))
+        scene.add(meshes[i % len(meshes)], position, rng.uniform(0, 2 * np.pi, 3), rng.uniform(0.5, 1.5))
+    return scene
+
+
+def visible_spheres(centers, radii, screen_width, screen_height, projection='p',
+                    scale=4, offset=(20, -20), fov=200, viewer_distance=45, near=1.0, zoom=1.0):
+    """
+    Frustum test for (I, 3) bounding-sphere centers in view space.
+    False for spheres entirely off the canvas once projected. With
+    perspective, spheres reaching the near plane are culled as well, since
+    their vertices cannot be projected.
+    """
+    screen = project_vertices(centers, screen_width, screen_height, projection,
+                              scale=scale, offset=offset, fov=fov, viewer_distance=viewer_distance, zoom=zoom)
+    if projection == 'o':
+        in_front = np.ones(len(centers), dtype=bool)
+        screen_radii = radii * scale * zoom
+    else:
+        nearest = viewer_distance + centers[:, 2] - radii
+        in_front = nearest > near
+        # radius as seen at the nearest point, an upper bound on the projected size
+        screen_radii = radii * fov * zoom / np.maximum(nearest, near)
+    return (in_front
+            & (screen[:, 0] + screen_radii >= 0) & (screen[:, 0] - screen_radii < screen_width)
+            & (screen[:, 1] + screen_radii >= 0) & (screen[:, 1] - screen_radii < screen_height))
+
+
+def instance_models(rotations, scales, frame):
+    """(I, 3, 3) model matrices, with the frame's spin applied in object space."""
+    return (rotations @ frame) * scales[:, None, None]
+
+
+def transform_instances(points, models, positions):
+    """Transform (N, 3) object-space points by every model at once; returns (I, N, 3)."""
+    return np.einsum('ijk,nk->inj', models, points) + positions[:, None, :]
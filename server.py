@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from color import COLOR_MODES, Palette
+from renderer import DIRECTIONAL_LIGHT, MODES, POINT_LIGHT, SHAPE_TYPES, SHAPES, Renderer, supports_mode
+from present import TerminalPresenter, full_frame
+
+
+def wire(data):
+    """Terminal text as bytes for a raw TCP stream; newlines become CRLF."""
+    return data.replace('\n', '\r\n').encode('latin-1')
+
+
+class Client:
+    """A connected viewer and its back-pressure state."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        # False until the client has received a full frame to apply diffs to
+        self.synced = False
+        self.dropped = 0
+
+
+class BroadcastServer:
+    """
+    Renders each frame once, encodes it once as an ANSI diff against the
+    previous frame and writes the same bytes to every connected client.
+
+    Writes never wait on a client. A client whose unsent backlog grows past
+    high_water stops receiving frames; once the backlog has drained below a
+    quarter of that, it skips straight to a keyframe of the latest frame.
+    Keyframes are encoded at most once per frame, only when a client needs one.
+    """
+
+    def __init__(self, renderer, shape, fps, high_water=64 * 1024):
+        self.renderer = renderer
+        self.shape = shape
+        self.fps = fps
+        self.high_water = high_water
+        self.low_water = high_water // 4
+        self.presenter = TerminalPresenter(palette=renderer.palette)
+        self.clients = set()
+        self.frames = 0
+        self.keyframes = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+        self.bytes_per_second = 0.0
+
+    async def handle_client(self, reader, writer):
+        """Register a viewer and keep it until it disconnects; its input is ignored."""
+        client = Client(writer)
+        self.clients.add(client)
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+    async def handle_metrics(self, reader, writer):
+        """Answer every connection with one line of JSON metrics."""
+        writer.write((json.dumps(self.metrics()) + "\n").encode())
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    def broadcast(self, frame, attributes=None):
+        """Send one rendered frame to every client, honouring back-pressure."""
+        diff = wire(self.presenter.encode(frame, attributes))
+        keyframe = None
+        for client in list(self.clients):
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            backlog = transport.get_write_buffer_size()
+            if backlog > self.high_water or (not client.synced and backlog > self.low_water):
+                # too far behind: drop frames until the backlog drains, then resync
+                client.synced = False
+                client.dropped += 1
+                self.frames_dropped += 1
+                continue
+            if client.synced:
+                data = diff
+            else:
+                if keyframe is None:
+                    keyframe = wire(full_frame(frame, attributes, self.presenter.palette))
+                    self.keyframes += 1
+                data = keyframe
+                client.synced = True
+            if data:
+                client.writer.write(data)
+                self.bytes_sent += len(data)
+
+    def metrics(self):
+        return {
+            "clients": len(self.clients),
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            "frames_dropped": self.frames_dropped,
+            "bytes_sent": self.bytes_sent,
+            "bytes_per_second": round(self.bytes_per_second, 1),
+        }
+
+    async def run(self, stats=False):
+        """Render loop: one frame per deadline, only while someone is watching."""
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.fps
+        start = deadline = last_report = loop.time()
+        reported_bytes = 0
+        while True:
+            if self.clients:
+                canvas = self.renderer.draw(self.shape, loop.time() - start)
+                self.broadcast(canvas.pixels, canvas.attributes)
+                self.frames += 1
+
+            now = loop.time()
+            if now - last_report >= 1:
+                self.bytes_per_second = (self.bytes_sent - reported_bytes) / (now - last_report)
+                reported_bytes, last_report = self.bytes_sent, now
+                if stats:
+                    print(json.dumps(self.metrics()), file=sys.stderr)
+
+            # skip missed deadlines rather than rendering a burst to catch up
+            deadline += interval
+            if deadline < now:
+                deadline = now
+            await asyncio.sleep(deadline - now)
+
+
+async def serve(args, shape):
+    light = POINT_LIGHT if args.light == 'point' else DIRECTIONAL_LIGHT
+    palette = Palette(args.color) if args.color != 'off' else None
+    renderer = Renderer(args.width, args.height, args.mode, args.projection, light, palette=palette)
+    server = BroadcastServer(renderer, shape, args.fps, args.high_water * 1024)
+
+    listener = await asyncio.start_server(server.handle_client, args.host, args.port)
+    print(f"Broadcasting on {args.host}:{args.port}", file=sys.stderr)
+    if args.metrics_port is not None:
+        await asyncio.start_server(server.handle_metrics, args.host, args.metrics_port)
+        print(f"Metrics on {args.host}:{args.metrics_port}", file=sys.stderr)
+    async with listener:
+        await server.run(args.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render once and broadcast the frames to TCP clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve one line of JSON metrics per connection on this port.")
+    parser.add_argument("--shape", default="cube",
+                        choices=list(SHAPE_TYPES))
+    parser.add_argument("--mode", choices=MODES, default="wireframe")
+    parser.add_argument("--projection", choices=["o", "p"], default="p")
+    parser.add_argument("--light", choices=["point", "directional"], default="point")
+    parser.add_argument("--color", choices=["off", *COLOR_MODES], default="off")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=40)
+    parser.add_argument("--segments", type=int, default=None,
+                        help="Mesh resolution for Sphere, Donut and Figure8.")
+    parser.add_argument("--high-water", type=int, default=64,
+                        help="Unsent KiB per client before it starts skipping frames.")
+    parser.add_argument("--stats", action="store_true", help="Print metrics to stderr every second.")
+    args = parser.parse_args()
+
+    shape = SHAPES.get(args.shape, segments=args.segments)
+    if not supports_mode(shape, args.mode):
+        parser.error(f"The shape '{args.shape}' does not support {args.mode} rendering.")
+
+    try:
+        asyncio.run(serve(args, shape))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
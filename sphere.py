@@ -3,35 +3,43 @@ import numpy as np
 class Sphere:
     def __init__(self, center, radius, segments=12, rings=12):
         c = np.array(center)
-        self.vertices = []
-        self.edges = []
-
-        # Generate vertices
-        for i in range(rings + 1):
-            theta = np.pi * i / rings  # From 0 to pi
-            sin_theta = np.sin(theta)
-            cos_theta = np.cos(theta)
-
-            for j in range(segments):
-                phi = 2 * np.pi * j / segments  # From 0 to 2pi
-                sin_phi = np.sin(phi)
-                cos_phi = np.cos(phi)
-
-                x = c[0] + radius * sin_theta * cos_phi
-                y = c[1] + radius * sin_theta * sin_phi
-                z = c[2] + radius * cos_theta
-
-                self.vertices.append([x, y, z])
-
-        # Generate edges
-        for i in range(rings):
-            for j in range(segments):
-                current = i * segments + j
-                next_segment = current + 1 if (j + 1) % segments else current + 1 - segments
-                next_ring = current + segments
-
-                if next_ring < len(self.vertices):
-                    self.edges.append((current, next_ring))
-                self.edges.append((current, next_segment))
-
-    
\ No newline at end of file
+        # the analytic surface, for sampling (see surface())
+        self.origin = c.astype(float)
+        self.sphere_radius = radius
+
+        # Generate vertices: one row per ring (theta from 0 to pi),
+        # one column per segment (phi from 0 to 2pi)
+        theta = np.pi * np.arange(rings + 1) / rings
+        phi = 2 * np.pi * np.arange(segments) / segments
+        sin_theta, cos_theta = np.sin(theta)[:, None], np.cos(theta)[:, None]
+        sin_phi, cos_phi = np.sin(phi)[None, :], np.cos(phi)[None, :]
+
+        x = c[0] + radius * sin_theta * cos_phi
+        y = c[1] + radius * sin_theta * sin_phi
+        z = c[2] + radius * cos_theta * np.ones_like(phi)[None, :]
+        self.vertices = np.stack([x, y, z], axis=-1).reshape(-1, 3)
+
+        # Generate edges: for every vertex above the last ring, one edge down
+        # to the next ring and one around to the next segment
+        i, j = np.meshgrid(np.arange(rings), np.arange(segments), indexing='ij')
+        current = i * segments + j
+        next_segment = i * segments + (j + 1) % segments
+        next_ring = current + segments
+        self.edges = np.stack([
+            np.stack([current, next_ring], axis=-1),
+            np.stack([current, next_segment], axis=-1),
+        ], axis=2).reshape(-1, 2).astype(np.int32)
+
+    def surface(self, u, v):
+        """
+        Points and unit outward normals of the sphere at parameters u (from
+        pole to pole) and v (around the axis), both in [0, 1].
+        """
+        theta, phi = np.pi * np.asarray(u), 2 * np.pi * np.asarray(v)
+        normals = np.stack([np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi),
+                            np.cos(theta) * np.ones_like(phi)], axis=-1)
+        return self.origin + self.sphere_radius * normals, normals
+
+    def surface_size(self):
+        """Longest distance covered along u and along v, for choosing sample counts."""
+        return np.pi * self.sphere_radius, 2 * np.pi * self.sphere_radius
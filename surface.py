@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+
+# samples per screen cell along each parameter direction; above 1 so that
+# neighbouring samples never leave a cell between them uncovered
+SAMPLE_DENSITY = 2.0
+# cap on the samples per frame, reached only on very large canvases
+MAX_SAMPLES = 1 << 21
+# sample counts are rounded up to a multiple of this, so a surface whose
+# projected size changes a little keeps its cached grid
+GRID_STEP = 16
+
+
+def supports_surface(shape):
+    """Whether the shape is a parametric surface (has surface() and surface_size())."""
+    return hasattr(shape, 'surface') and hasattr(shape, 'surface_size')
+
+
+def surface_resolution(shape, cells_per_unit, density=SAMPLE_DENSITY, max_samples=MAX_SAMPLES):
+    """
+    Samples along u and v so that neighbouring samples project about
+    1 / density cells apart, given the on-screen cells per object unit.
+    """
+    counts = [max(1.0, length * cells_per_unit * density) for length in shape.surface_size()]
+    total = counts[0] * counts[1]
+    if total > max_samples:
+        counts = [count * math.sqrt(max_samples / total) for count in counts]
+    return tuple(max(GRID_STEP, GRID_STEP * math.ceil(count / GRID_STEP)) for count in counts)
+
+
+def surface_samples(shape, cells_per_unit):
+    """
+    Object-space points and unit normals of the shape's surface on a grid
+    of cell-centered (u, v) samples, (N, 3) each, and the dot product of
+    each normal with its point (see facing_viewer). The grid for the last
+    resolution is kept on the shape, so it is evaluated only when the
+    projected size changes enough to need another resolution.
+    """
+    resolution = surface_resolution(shape, cells_per_unit)
+    cached = getattr(shape, 'surface_grid', None)
+    if cached is None or cached[0] != resolution:
+        count_u, count_v = resolution
+        u, v = np.meshgrid((np.arange(count_u) + 0.5) / count_u, (np.arange(count_v) + 0.5) / count_v,
+                           indexing='ij')
+        points, normals = shape.surface(u.ravel(), v.ravel())
+        planes = np.einsum('ij,ij->i', normals, points)
+        cached = shape.surface_grid = (resolution, points, normals, planes)
+    return cached[1:]
+
+
+def facing_viewer(normals, planes, matrix, projection='p', viewer_distance=45):
+    """
+    Samples whose outward normal points towards the viewer once rotated by
+    matrix. Rotation keeps dot products, so the test runs on the
+    object-space normals, with the viewer moved into object space and
+    planes holding each sample's normal . point.
+    """
+    if projection == 'o':
+        # z of the rotated normal
+        return normals @ matrix[2] < 0
+    viewer = matrix.T @ np.array([0.0, 0.0, -viewer_distance])
+    return normals @ viewer > planes
+
+
+def splat(canvas, cells, depths, codes, attributes=None):
+    """
+    Write point samples into a canvas with a depth buffer: (N, 2) integer
+    screen cells, their depths (smaller is nearer) and glyph codes. Each
+    cell keeps its nearest sample, by a scatter-min into the depth buffer
+    (canvas.kernels.splat).
+    """
+    x, y = cells[:, 0], cells[:, 1]
+    inside = (x >= 0) & (x < canvas.width) & (y >= 0) & (y < canvas.height)
+    colors = attributes[inside] if attributes is not None and canvas.attributes is not None else None
+    target = canvas.attributes if colors is not None else None
+    canvas.pixels_written += canvas.kernels.splat(canvas.pixels, canvas.depth, target, x[inside], y[inside],
+                                                  depths[inside], codes[inside], colors)
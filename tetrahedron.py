@@ -14,7 +14,7 @@ class Tetrahedron:
         ])
 
         # Define the edges connecting the vertices
-        self.edges = [
+        self.edges = np.array([
             (0, 1), (1, 2), (2, 0),  # Base triangle
             (0, 3), (1, 3), (2, 3)   # Sides
-        ]
+        ], dtype=np.int32)
@@ -0,0 +1,109 @@
+import numpy as np
+from rotate import rotation_matrix_x, rotation_matrix_y, rotation_matrix_z
+
+
+def frame_matrix(angle_x, angle_y, angle_z):
+    """
+    Combined rotation matrix for one frame.
+    Applies X, then Y, then Z, matching rotate_vertex.
+    """
+    return rotation_matrix_z(angle_z) @ rotation_matrix_y(angle_y) @ rotation_matrix_x(angle_x)
+
+
+def rotate_vertices(vertices, matrix, out=None):
+    """
+    Rotate an (N, 3) vertex array by a 3x3 matrix in one operation.
+    If out is given, the result is written into it instead of a new array.
+    """
+    return np.matmul(np.asarray(vertices, dtype=float), matrix.T, out=out)
+
+
+def project_vertices(vertices, screen_width, screen_height, projection='p',
+                     scale=4, offset=(20, -20), fov=200, viewer_distance=45, zoom=1.0, out=None):
+    """
+    Project an (N, 3) array of rotated vertices onto 2D screen coordinates.
+    Returns an (N, 2) array, written into out if given; same formulas as
+    project_vertex ('o') and perspective_projection ('p'). zoom multiplies
+    scale, offset and fov, for canvases larger or smaller than 80x40.
+    """
+    x = vertices[:, 0]
+    y = vertices[:, 1]
+    z = vertices[:, 2]
+    projected = np.empty((len(vertices), 2)) if out is None else out
+    px, py = projected[:, 0], projected[:, 1]
+    # computed in place, rounding exactly like project_vertex and
+    # perspective_projection
+    if projection == 'o':
+        np.multiply(x, scale * zoom, out=px)
+        px += offset[0] * zoom
+        np.multiply(y, -scale * zoom, out=py)
+        py -= offset[1] * zoom
+    else:
+        # py holds the perspective factor until x has been projected
+        np.add(z, viewer_distance, out=py)
+        np.divide(fov * zoom, py, out=py)
+        np.multiply(x, py, out=px)
+        px += screen_width / 2
+        np.multiply(y, py, out=py)
+        np.negative(py, out=py)
+        py += screen_height / 2
+    return projected
+
+
+def transform_vertices(vertices, angles, screen_width, screen_height, projection='p'):
+    """
+    Rotate and project all vertices of a shape for one frame.
+    Returns the rotated (N, 3) and projected (N, 2) arrays.
+    """
+    rotated = rotate_vertices(vertices, frame_matrix(*angles))
+    return rotated, project_vertices(rotated, screen_width, screen_height, projection)
+
+
+def vertex_depths(vertices, projection='p', viewer_distance=45, out=None):
+    """
+    Depth of each rotated vertex for z-buffering; smaller values are nearer.
+    For perspective this is -1 / w, which varies linearly across a planar
+    face in screen space, so it can be interpolated per pixel.
+    """
+    z = vertices[:, 2]
+    depths = np.empty(len(vertices)) if out is None else out
+    if projection == 'o':
+        depths[:] = z
+    else:
+        np.add(z, viewer_distance, out=depths)
+        np.divide(-1.0, depths, out=depths)
+    return depths
+
+
+def front_facing(normals, centers, projection='p', viewer_distance=45, convex_center=None):
+    """
+    Back-face test for an (F, 3) array of unit face normals and centers.
+    A face is kept when its normal, taken from its winding, points towards
+    the viewer; this only drops hidden faces of closed, consistently wound
+    meshes. For convex meshes of unknown winding, convex_center (the
+    rotated shape center) flips normals to point away from it first, and
+    faces whose plane passes through it are kept as two-sided.
+    """
+    facing = normals
+    if convex_center is not None:
+        offsets = centers - convex_center
+        outward = np.sum(normals * offsets, axis=1)
+        facing = normals * np.where(outward < 0, -1.0, 1.0)[:, None]
+    if projection == 'o':
+        to_viewer = np.array([0.0, 0.0, -1.0])
+    else:
+        to_viewer = np.array([0.0, 0.0, -viewer_distance]) - centers
+    visible = np.sum(facing * to_viewer, axis=1) > 0
+    if convex_center is not None:
+        visible |= np.abs(outward) <= 1e-6 * np.linalg.norm(offsets, axis=1)
+    return visible
+
+
+def screen_radius(center, radius, projection='p', scale=4, fov=200, viewer_distance=45, zoom=1.0):
+    """
+    Approximate on-screen radius, in cells, of a bounding sphere whose
+    center has already been rotated. Uses the same scale as project_vertices.
+    """
+    if projection == 'o':
+        return radius * scale * zoom
+    return radius * fov * zoom / max(viewer_distance + center[2], 1e-6)